@@ -1,24 +1,19 @@
-from settings import *
-import torch
+import numpy as np
+from game.rules import *
+from game.bitboard import Bitboard
+from game.placements import generate_moves
+from game.move_search import reachable_moves, hold_pieces
+from board_features import FeatureCache, board_features, weighted_score, feature_tensor
+from transposition import board_hash
 
 def get_valid_actions(piece_type, board):
-    valid_actions = []
-
-    for rotation_index, rotation in enumerate(TETROMINOS[piece_type]['rotations']):
-        # get min/max x offset for current rotation
-        x_offsets = [x for x, y in rotation]
-        min_x = min(x_offsets)
-        max_x = max(x_offsets)
-
-        # loop all valid x_positions for this rotation
-        for x_pos in range(-min_x, COLUMNS - max_x):
-            y = get_lowest_valid_y(rotation, x_pos, board)
-            if y is not None:
-                valid_actions.append((rotation_index, x_pos))
-
-    return valid_actions
+    # duplicate rotations are only listed once, see game.placements
+    return [(rotation_index, x_pos) for rotation_index, x_pos, y in generate_moves(piece_type, board)]
 
 def get_lowest_valid_y(rotation, x_position, board):
+    if isinstance(board, Bitboard):
+        return board.lowest_valid_y(rotation, x_position)
+
     max_y_offset = max(y for cell, y in rotation)
 
     for y in reversed(range(ROWS - max_y_offset)):
@@ -44,166 +39,125 @@ def get_lowest_valid_y(rotation, x_position, board):
     return None 
 
 def evaluate_board(board, weights):
-    ROWS = len(board)
-    COLUMNS = len(board[0])
-
-    holes = 0
-    heights = [0 for _ in range(COLUMNS)]
-    bumpiness = 0
-    lines_cleared = 0
-
-    # heights and holes
-    for x in range(COLUMNS):
-        block_found = False
-        for y in range(ROWS):
-            if board[y][x] != 0:
-                if not block_found:
-                    heights[x] = ROWS - y
-                    block_found = True
-            elif block_found:
-                holes += 1
-
-    # bumpiness
-    for x in range(COLUMNS - 1):
-        bumpiness += abs(heights[x] - heights[x + 1])
-
-    # lines cleared
-    for row in board:
-        if all(cell != 0 for cell in row):
-            lines_cleared += 1
-
-    # max column height
-    max_height = max(heights)
-
-    # wells
-    wells = 0
-    for x in range(1, COLUMNS - 1):
-        if heights[x] < heights[x - 1] and heights[x] < heights[x + 1]:
-            wells += (heights[x - 1] - heights[x]) + (heights[x + 1] - heights[x])
-
-    # row transitions
-    row_transitions = 0
-    for row in board:
-        prev = 1  # wall on left
-        for cell in row:
-            if cell != prev:
-                row_transitions += 1
-            prev = cell
-        if prev == 0:
-            row_transitions += 1  # right wall
-
-    # column transitions
-    col_transitions = 0
-    for x in range(COLUMNS):
-        prev = 1  # floor
-        for y in range(ROWS):
-            cell = board[y][x]
-            if cell != prev:
-                col_transitions += 1
-            prev = cell
-
     # final weighted score using all 8 features
-    score = (
-        weights[0] * holes +
-        weights[1] * lines_cleared +
-        weights[2] * bumpiness +
-        weights[3] * sum(heights) +       # total_height
-        weights[4] * max_height +
-        weights[5] * wells +
-        weights[6] * row_transitions +
-        weights[7] * col_transitions
-    )
-
-    return score
-
-def pick_best_action(piece_type, board, weights=None):
+    return weighted_score(board_features(board), weights)
+
+def candidate_features(piece_type, board, table=None, reachable=False):
+    # every drop of the piece with the raw features of its afterstate.
+    # reachable=True lists the spots reachable with shifts, rotations and soft drops
+    # (game.move_search) instead of the lowest free spot per rotation and column.
+    # with a TranspositionTable the result is cached per (board, piece), don't change it
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_field(board)
+    if table is not None:
+        key = (board_hash(board), piece_type, reachable)
+        cached = table.get(key)
+        if cached is not None:
+            return cached
+
+    # only the rows and columns each drop touches are re-evaluated
+    cache = FeatureCache(board)
+    rotations = TETROMINOS[piece_type]['rotations']
+    moves = reachable_moves(piece_type, board) if reachable else generate_moves(piece_type, board)
+    features = [cache.child_features(rotations[rotation_index], x_pos, y) for rotation_index, x_pos, y in moves]
+
+    if table is not None:
+        table.put(key, (moves, features))
+    return moves, features
+
+DEFAULT_WEIGHTS = [-5.0, 3.0, -0.5, -0.1]
+
+def pick_best_action(piece_type, board, weights=None, table=None, reachable=False):
+    # returns (rotation_index, x_pos), or (rotation_index, x_pos, y) with reachable=True
+    # since a slid or tucked piece does not rest on the lowest free spot
     if weights is None:
         # fallback to default weights
-        weights = [-5.0, 3.0, -0.5, -0.1]
+        weights = DEFAULT_WEIGHTS
 
     best_score = float('-inf')
     best_action = None
 
-    for rotation_index, x_pos in get_valid_actions(piece_type, board):
-        rotation = TETROMINOS[piece_type]['rotations'][rotation_index]
-        y = get_lowest_valid_y(rotation, x_pos, board)
-
-        if y is None:
-            continue
-        
-        # simulate dropping the piece
-        temp_board = [row[:] for row in board]
-        for dx, dy in rotation:
-            px = x_pos + dx
-            py = y + dy
-            if 0 <= px < COLUMNS and 0 <= py < ROWS:
-                temp_board[py][px] = 1
-
-        # evaluate the resulting board
-        score = evaluate_board(temp_board, weights)
+    moves, features = candidate_features(piece_type, board, table, reachable)
+    for move, move_features in zip(moves, features):
+        score = weighted_score(move_features, weights)
         if score > best_score:
             best_score = score
-            best_action = (rotation_index, x_pos)
+            best_action = move if reachable else move[:2]
 
     return best_action
 
-def extract_features(board):
-    ROWS = len(board)
-    COLUMNS = len(board[0])
-
-    holes = 0
-    heights = [0 for _ in range(COLUMNS)]
-    bumpiness = 0
-    lines_cleared = 0
-
-    for x in range(COLUMNS):
-        block_found = False
-        for y in range(ROWS):
-            if board[y][x] != 0:
-                if not block_found:
-                    heights[x] = ROWS - y
-                    block_found = True
-            elif block_found:
-                holes += 1
-
-    for x in range(COLUMNS - 1):
-        bumpiness += abs(heights[x] - heights[x + 1])
-
-    max_height = max(heights)
-    total_height = sum(heights)
-
-    wells = 0
-    for x in range(1, COLUMNS - 1):
-        if heights[x] < heights[x - 1] and heights[x] < heights[x + 1]:
-            wells += (heights[x - 1] - heights[x]) + (heights[x + 1] - heights[x])
-
-    row_transitions = 0
-    for row in board:
-        prev = 1
-        for cell in row:
-            if cell != prev:
-                row_transitions += 1
-            prev = cell
-        if prev == 0:
-            row_transitions += 1
-
-    col_transitions = 0
-    for x in range(COLUMNS):
-        prev = 1
-        for y in range(ROWS):
-            cell = board[y][x]
-            if cell != prev:
-                col_transitions += 1
-            prev = cell
-
-    return torch.tensor([
-        holes,
-        lines_cleared,
-        bumpiness,
-        total_height,
-        max_height,
-        wells,
-        row_transitions,
-        col_transitions
-    ], dtype=torch.float32)
+def pick_hold_action(piece_type, hold_type, next_type, board, weights=None, table=None):
+    # best of game.move_search.hold_moves as (used_hold, rotation_index, x_pos, y),
+    # None when neither piece fits. ties keep the current piece
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+
+    best_score = float('-inf')
+    best_action = None
+
+    for used_hold, hold_piece in hold_pieces(piece_type, hold_type, next_type):
+        moves, features = candidate_features(hold_piece, board, table, reachable=True)
+        for move, move_features in zip(moves, features):
+            score = weighted_score(move_features, weights)
+            if score > best_score:
+                best_score = score
+                best_action = (used_hold,) + move
 
+    return best_action
+
+def get_candidate_features(piece_type, board, table=None):
+    # every drop of the piece with the DQN input features of its afterstate,
+    # lines cleared stays 0 like extract_features
+    moves, features = candidate_features(piece_type, board, table)
+    return moves, [f[:1] + [0] + f[2:] for f in features]
+
+def unique_rows(features):
+    # (distinct feature rows, index of every row among them) for batched value functions.
+    # identical afterstates share one row, so they also share the exact same value
+    rows = {}
+    index = [rows.setdefault(tuple(f), len(rows)) for f in features]
+    return list(rows), index
+
+def pick_value_action(model, values, piece_type, board, table=None, value_table=None):
+    # the drop with the highest values(model, features), for any DQN runtime.
+    # table caches the candidate features, value_table the values; only give a
+    # value_table for a model that is not being trained
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_field(board)
+    moves, features = get_candidate_features(piece_type, board, table)
+    if not moves:
+        return None
+
+    q_values = None
+    if value_table is not None:
+        key = (board_hash(board), piece_type, model)
+        q_values = value_table.get(key)
+    if q_values is None:
+        q_values = values(model, features)
+        if value_table is not None:
+            value_table.put(key, q_values)
+
+    # first best move wins ties
+    rot_idx, x_pos, y = moves[int(np.argmax(np.asarray(q_values)))]
+    return (rot_idx, x_pos)
+
+def place_piece(board, rotation, x_pos, y):
+    # copy of the board with the piece locked at (x_pos, y)
+    if isinstance(board, Bitboard):
+        temp_board = board.copy()
+        temp_board.lock(rotation, x_pos, y)
+        return temp_board
+
+    temp_board = [row[:] for row in board]
+    for dx, dy in rotation:
+        px = x_pos + dx
+        py = y + dy
+        if 0 <= px < COLUMNS and 0 <= py < ROWS:
+            temp_board[py][px] = 1
+    return temp_board
+
+def extract_features(board):
+    # lines cleared stays 0 here, the shipped DQN models were trained that way
+    features = board_features(board)
+    features[1] = 0
+    return feature_tensor(features)
@@ -0,0 +1,104 @@
+import time
+from game.rules import TETROMINOS
+from game.bitboard import Bitboard
+from board_features import weighted_score
+from ai_controller import candidate_features
+
+# lookahead over the current piece and the preview queue.
+# beam search: every level drops the next piece on the best boards of the level
+# before, identical boards are kept only once, and when the time budget runs out
+# the best first move of the last finished level is returned.
+# an evaluator gives (values, rewards) for the feature rows of one level: a path is
+# ranked by the rewards of the placements before its last one plus the value of the
+# last one, so rows cleared on the way to a board still count
+
+BEAM_WIDTH = 8
+TIME_BUDGET = 0.010  # seconds per move
+CLEAR_REWARD = 10  # per line, the reward dqn/train_dqn trains with
+GAMMA = 0.99
+
+def weights_evaluator(weights):
+    # GA heuristic, one score per feature row; the lines weight credits every clear
+    def evaluate(features, depth):
+        values = [weighted_score(f, weights) for f in features]
+        rewards = [weights[1] * f[1] for f in features]
+        return values, rewards
+    return evaluate
+
+def dqn_evaluator(model):
+    # DQN value of every afterstate, one forward pass per level.
+    # a NumpyDQN (the live game) is evaluated without importing torch
+    from models.numpy_dqn import NumpyDQN, numpy_values
+    if isinstance(model, NumpyDQN):
+        model_values = numpy_values
+    else:
+        from models.dqn_model import dqn_values as model_values
+
+    def evaluate(features, depth):
+        # lines cleared stays 0, same input as extract_features. clears earn the
+        # training reward instead, everything discounted per level
+        rows = [f[:1] + [0] + f[2:] for f in features]
+        discount = GAMMA ** depth
+        rewards = [discount * CLEAR_REWARD * f[1] for f in features]
+        values = [reward + discount * value for reward, value in zip(rewards, model_values(model, rows).tolist())]
+        return values, rewards
+    return evaluate
+
+def plan_action(piece_type, board, next_shapes, evaluate, beam_width=BEAM_WIDTH, time_budget=TIME_BUDGET, table=None):
+    # returns (rotation_index, x_pos) for the current piece, None when it cannot be placed.
+    # with no preview shapes this picks the same move as a single-piece search.
+    # a TranspositionTable keeps the candidates of boards from earlier moves, the
+    # beam of one move is mostly the root of the next
+    deadline = time.perf_counter() + time_budget
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_field(board)
+    shapes = [piece_type] + list(next_shapes)
+
+    # beam entries: (board, first move on the path to it, rewards on the path)
+    beam = [(board, None, 0)]
+    best_action = None
+
+    for depth, shape in enumerate(shapes):
+        rotations = TETROMINOS[shape]['rotations']
+        candidates = []
+        features = []
+        for parent, first_action, path_reward in beam:
+            # the current piece is always searched, deeper levels only while there is time
+            if depth and time.perf_counter() > deadline:
+                return best_action
+
+            moves, move_features = candidate_features(shape, parent, table)
+            features += move_features
+            for rotation_index, x_pos, y in moves:
+                rotation = rotations[rotation_index]
+                candidates.append((parent, first_action if depth else (rotation_index, x_pos), path_reward, rotation, x_pos, y))
+
+        # every board on the beam topped out, keep the answer of the level before
+        if not candidates:
+            break
+
+        # best first, ties keep the generation order
+        values, rewards = evaluate(features, depth)
+        scores = [candidate[2] + value for candidate, value in zip(candidates, values)]
+        order = sorted(range(len(candidates)), key=lambda i: -scores[i])
+        best_action = candidates[order[0]][1]
+        if depth == len(shapes) - 1:
+            break
+
+        # prune to the beam width, boards reached by different paths only once
+        seen = set()
+        beam = []
+        for i in order:
+            parent, first_action, path_reward, rotation, x_pos, y = candidates[i]
+            child = parent.copy()
+            child.lock(rotation, x_pos, y)
+            child.clear_full_rows()
+
+            if child in seen:
+                continue
+            seen.add(child)
+            beam.append((child, first_action, path_reward + rewards[i]))
+            if len(beam) == beam_width:
+                break
+
+    return best_action
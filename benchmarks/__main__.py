@@ -0,0 +1,48 @@
+import sys
+import json
+import argparse
+from benchmarks.corpus import build_corpus
+from benchmarks.suite import BENCHMARKS, REPEATS, MIN_TIME, TOLERANCE, run_suite, compare
+
+# python -m benchmarks                          print results
+# python -m benchmarks --out baseline.json      store a baseline
+# python -m benchmarks --compare baseline.json  exit code 1 when something got slower
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='AI hot path throughput')
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run, default all: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--out', help='write the results as JSON')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='allowed slowdown, 0.1 = 10%%')
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--min-time', type=float, default=MIN_TIME, help='seconds per timed run')
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark {', '.join(unknown)}, choose from {', '.join(BENCHMARKS)}")
+
+    corpus = build_corpus()
+    results = run_suite(corpus, args.names, args.repeats, args.min_time)
+
+    for name, result in results['benchmarks'].items():
+        print(f"{name:>20}: {result['ops_per_sec']:12.1f} ops/s ({result['ops']} ops in {result['seconds']:.3f} s)")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+        print(f"\n Compared to {args.compare}\n")
+        regressions = 0
+        for name, before, after, ratio, regressed in compare(results, baseline, args.tolerance):
+            flag = 'REGRESSION' if regressed else ''
+            print(f"{name:>20}: {before:12.1f} -> {after:12.1f} ops/s  x{ratio:.2f} {flag}")
+            regressions += regressed
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import random
+from game.rules import TETROMINOS
+from game.headless import HeadlessMain
+from ai_controller import get_valid_actions, pick_best_action, place_piece
+
+# fixed board corpora: the same seed always gives the same boards, so runs on
+# different commits time exactly the same work
+
+CORPUS_SEED = 2024
+CORPUS_GAMES = 4
+BOARDS_PER_GAME = 150
+RANDOM_MOVE_CHANCE = 0.1  # keeps the stacks from being too tidy
+CORPUS_WEIGHTS = [-4.93, 5.89, -2.68, -8.76, -1.89, 0.68, -10.67, -11.09]
+
+class Corpus:
+    def __init__(self, positions, afterstates, game_seeds):
+        self.positions = positions      # (Bitboard, piece_type) before a move
+        self.afterstates = afterstates  # Bitboard right after a move, before line clears
+        self.game_seeds = game_seeds    # piece sequence seeds for whole games
+
+def build_corpus(seed=CORPUS_SEED, games=CORPUS_GAMES, boards_per_game=BOARDS_PER_GAME):
+    rng = random.Random(seed)
+    game_seeds = [rng.randrange(1 << 30) for _ in range(games)]
+    main = HeadlessMain()
+    positions = []
+    afterstates = []
+
+    for game_seed in game_seeds:
+        main.reset_game(game_seed)
+        for _ in range(boards_per_game):
+            board = main.ai_game.board
+            piece_type = main.ai_game.tetromino.shape
+            positions.append((board.copy(), piece_type))
+
+            action = pick_best_action(piece_type, board, CORPUS_WEIGHTS)
+            if action is None:
+                break
+            if rng.random() < RANDOM_MOVE_CHANCE:
+                action = rng.choice(get_valid_actions(piece_type, board))
+
+            rotation_index, x_pos = action
+            rotation = TETROMINOS[piece_type]['rotations'][rotation_index]
+            afterstates.append(place_piece(board, rotation, x_pos, board.lowest_valid_y(rotation, x_pos)))
+            main.ai_game.apply_action(piece_type, rotation_index, x_pos)
+
+    return Corpus(positions, afterstates, game_seeds)
@@ -0,0 +1,138 @@
+import sys
+import time
+import platform
+from game.rules import TETROMINOS
+from game.headless import HeadlessMain
+from game.move_search import reachable_moves
+from ai_controller import get_valid_actions, get_lowest_valid_y, evaluate_board, extract_features, pick_best_action
+from benchmarks.corpus import CORPUS_SEED, CORPUS_WEIGHTS
+
+# throughput of the AI hot path. every benchmark runs over the whole corpus and
+# returns how many operations it did; the runner does one untimed warm-up run
+# (lazy torch import, model loading) and keeps the best of REPEATS timed runs.
+# a timed run repeats the corpus pass until MIN_TIME has passed, short passes are
+# otherwise swamped by timer and scheduler noise
+
+REPEATS = 3
+MIN_TIME = 0.2  # seconds per timed run
+GAME_STEPS = 300
+DQN_MODEL = 'models/easy/dqn_easy.pt'
+NUMPY_DQN_MODEL = 'models/easy/dqn_easy.npz'
+TOLERANCE = 0.10  # slower than the baseline by more than this is a regression
+
+def bench_get_valid_actions(corpus):
+    for board, piece_type in corpus.positions:
+        get_valid_actions(piece_type, board)
+    return len(corpus.positions)
+
+def bench_reachable_moves(corpus):
+    for board, piece_type in corpus.positions:
+        reachable_moves(piece_type, board)
+    return len(corpus.positions)
+
+def bench_get_lowest_valid_y(corpus):
+    calls = 0
+    for board, piece_type in corpus.positions:
+        for rotation in TETROMINOS[piece_type]['rotations']:
+            for x_pos in range(-2, 10):
+                get_lowest_valid_y(rotation, x_pos, board)
+                calls += 1
+    return calls
+
+def bench_evaluate_board(corpus):
+    for board in corpus.afterstates:
+        evaluate_board(board, CORPUS_WEIGHTS)
+    return len(corpus.afterstates)
+
+def bench_extract_features(corpus):
+    for board in corpus.afterstates:
+        extract_features(board)
+    return len(corpus.afterstates)
+
+def bench_pick_best_action(corpus):
+    for board, piece_type in corpus.positions:
+        pick_best_action(piece_type, board, CORPUS_WEIGHTS)
+    return len(corpus.positions)
+
+def bench_dqn_action(corpus):
+    from models.dqn_model import load_agent, pick_dqn_action
+    model = load_agent(DQN_MODEL)
+    for board, piece_type in corpus.positions:
+        pick_dqn_action(model, piece_type, board)
+    return len(corpus.positions)
+
+def bench_numpy_dqn_action(corpus):
+    from models.numpy_dqn import load_numpy_agent, pick_numpy_action
+    model = load_numpy_agent(NUMPY_DQN_MODEL)
+    for board, piece_type in corpus.positions:
+        pick_numpy_action(model, piece_type, board)
+    return len(corpus.positions)
+
+def bench_headless_game(corpus):
+    # whole seeded games: move choice, placement, line clears and scoring
+    main = HeadlessMain()
+    pieces = 0
+    for seed in corpus.game_seeds:
+        main.reset_game(seed)
+        for _ in range(GAME_STEPS):
+            piece_type = main.ai_game.tetromino.shape
+            action = pick_best_action(piece_type, main.ai_game.board, CORPUS_WEIGHTS)
+            if action is None:
+                break
+            main.ai_game.apply_action(piece_type, *action)
+            pieces += 1
+    return pieces
+
+BENCHMARKS = {
+    'get_valid_actions': bench_get_valid_actions,
+    'reachable_moves': bench_reachable_moves,
+    'get_lowest_valid_y': bench_get_lowest_valid_y,
+    'evaluate_board': bench_evaluate_board,
+    'extract_features': bench_extract_features,
+    'pick_best_action': bench_pick_best_action,
+    'dqn_action': bench_dqn_action,
+    'numpy_dqn_action': bench_numpy_dqn_action,
+    'headless_game': bench_headless_game,
+}
+
+def timed_run(benchmark, corpus, min_time):
+    # (ops, seconds) over as many corpus passes as fit in min_time, at least one
+    ops = 0
+    start = time.perf_counter()
+    while True:
+        ops += benchmark(corpus)
+        seconds = time.perf_counter() - start
+        if seconds >= min_time:
+            return ops, seconds
+
+def run_suite(corpus, names=None, repeats=REPEATS, min_time=MIN_TIME):
+    # JSON-ready results: ops per second for every benchmark
+    results = {}
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name](corpus)
+        best = None
+        for _ in range(repeats):
+            ops, seconds = timed_run(BENCHMARKS[name], corpus, min_time)
+            if best is None or ops / seconds > best[0] / best[1]:
+                best = (ops, seconds)
+        ops, seconds = best
+        results[name] = {'ops': ops, 'seconds': seconds, 'ops_per_sec': ops / seconds}
+
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'corpus_seed': CORPUS_SEED,
+        'min_time': min_time,
+        'benchmarks': results,
+    }
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    # [(name, baseline ops/s, current ops/s, ratio, regressed)] for benchmarks in both runs
+    rows = []
+    for name, current in results['benchmarks'].items():
+        if name not in baseline['benchmarks']:
+            continue
+        before = baseline['benchmarks'][name]['ops_per_sec']
+        ratio = current['ops_per_sec'] / before
+        rows.append((name, before, current['ops_per_sec'], ratio, ratio < 1 - tolerance))
+    return rows
@@ -0,0 +1,231 @@
+import numpy as np
+from game.rules import COLUMNS, ROWS
+from game.bitboard import Bitboard, piece_rows, piece_columns
+
+# order of the 8 board features used by the GA weights and the DQN input
+FEATURE_NAMES = [
+    'holes',
+    'lines_cleared',
+    'bumpiness',
+    'total_height',
+    'max_height',
+    'wells',
+    'row_transitions',
+    'col_transitions'
+]
+
+_column_bits = 1 << np.arange(COLUMNS, dtype=np.int64)
+
+def stack_boards(boards):
+    # list of Bitboards or nested lists -> (N, ROWS, COLUMNS) array of 0/1
+    if len(boards) and isinstance(boards[0], Bitboard):
+        rows = np.array([board.rows for board in boards], dtype=np.int64)
+        return ((rows[:, :, None] & _column_bits) != 0).astype(np.int8)
+    return (np.asarray(boards) != 0).astype(np.int8).reshape(-1, ROWS, COLUMNS)
+
+def extract_features_batch(boards):
+    # (N, ROWS, COLUMNS) boards -> (N, 8) features, same definitions as ai_controller.evaluate_board
+    filled = np.asarray(boards) != 0
+    if filled.ndim == 2:
+        filled = filled[None]
+    num_rows = filled.shape[1]
+
+    # heights and holes
+    has_block = filled.any(axis=1)
+    top = filled.argmax(axis=1)
+    heights = np.where(has_block, num_rows - top, 0)
+    covered = np.logical_or.accumulate(filled, axis=1)
+    holes = (covered & ~filled).sum(axis=(1, 2))
+
+    # bumpiness, lines, total and max height
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+    lines_cleared = filled.all(axis=2).sum(axis=1)
+    total_height = heights.sum(axis=1)
+    max_height = heights.max(axis=1)
+
+    # wells: columns lower than both neighbours
+    left, middle, right = heights[:, :-2], heights[:, 1:-1], heights[:, 2:]
+    is_well = (middle < left) & (middle < right)
+    wells = np.where(is_well, (left - middle) + (right - middle), 0).sum(axis=1)
+
+    # row transitions, walls count as filled on both sides
+    wall = np.ones(filled.shape[:2] + (1,), dtype=bool)
+    padded_rows = np.concatenate([wall, filled, wall], axis=2)
+    row_transitions = (padded_rows[:, :, 1:] != padded_rows[:, :, :-1]).sum(axis=(1, 2))
+
+    # column transitions, starting from a filled cell above the top row
+    ceiling = np.ones((filled.shape[0], 1, filled.shape[2]), dtype=bool)
+    padded_cols = np.concatenate([ceiling, filled], axis=1)
+    col_transitions = (padded_cols[:, 1:] != padded_cols[:, :-1]).sum(axis=(1, 2))
+
+    return np.stack([
+        holes,
+        lines_cleared,
+        bumpiness,
+        total_height,
+        max_height,
+        wells,
+        row_transitions,
+        col_transitions
+    ], axis=1).astype(np.float32)
+
+def evaluate_boards(boards, weights):
+    # weighted score per board, added up in the same order as evaluate_board
+    features = extract_features_batch(boards).astype(np.float64)
+    scores = np.zeros(features.shape[0])
+    for i, weight in enumerate(weights):
+        scores = scores + weight * features[:, i]
+    return scores
+
+# single board: one sweep over the row masks gives all 8 features.
+# evaluate_board, extract_features and the GA/DQN loops all go through here
+
+_ROW_BITS = (1 << (COLUMNS + 1)) - 1
+_RIGHT_WALL = 1 << (COLUMNS + 1)
+
+def _row_transitions(mask):
+    # walls on both sides count as filled
+    padded = (mask << 1) | 1 | _RIGHT_WALL
+    return ((padded ^ (padded >> 1)) & _ROW_BITS).bit_count()
+
+# row transitions for every possible row
+_ROW_TRANSITIONS = [_row_transitions(mask) for mask in range(1 << COLUMNS)]
+
+def board_features(board):
+    # raw feature list, same order as FEATURE_NAMES
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_field(board)
+    rows = board.rows
+    full_row = (1 << COLUMNS) - 1
+
+    lines_cleared = 0
+    row_transitions = 0
+    col_transitions = 0
+    prev = full_row  # filled ceiling above the top row
+
+    for mask in rows:
+        if mask == full_row:
+            lines_cleared += 1
+
+        row_transitions += _ROW_TRANSITIONS[mask]
+        col_transitions += (mask ^ prev).bit_count()
+        prev = mask
+
+    # heights and holes come from the column profile
+    heights = board.heights
+    holes = sum(board.holes)
+
+    bumpiness = 0
+    for x in range(COLUMNS - 1):
+        bumpiness += abs(heights[x] - heights[x + 1])
+
+    wells = 0
+    for x in range(1, COLUMNS - 1):
+        if heights[x] < heights[x - 1] and heights[x] < heights[x + 1]:
+            wells += (heights[x - 1] - heights[x]) + (heights[x + 1] - heights[x])
+
+    return [
+        holes,
+        lines_cleared,
+        bumpiness,
+        sum(heights),
+        max(heights),
+        wells,
+        row_transitions,
+        col_transitions
+    ]
+
+def weighted_score(features, weights):
+    # GA score; a shorter weight list only scores the first features
+    score = 0
+    for weight, feature in zip(weights, features):
+        score += weight * feature
+    return score
+
+def feature_tensor(features):
+    # DQN input; torch is only imported when a model asks for it
+    import torch
+    return torch.tensor(features, dtype=torch.float32)
+
+# incremental features: cache the per-row and per-column parts of a parent board,
+# then a candidate placement only recomputes the rows and columns the piece touches
+
+def _bumpiness(heights, first, last):
+    # bumpiness of the neighbour pairs touching columns first..last
+    bumpiness = 0
+    for x in range(max(first - 1, 0), min(last, COLUMNS - 2) + 1):
+        bumpiness += abs(heights[x] - heights[x + 1])
+    return bumpiness
+
+def _wells(heights, first, last):
+    # wells of columns first..last and their neighbours
+    wells = 0
+    for x in range(max(first - 1, 1), min(last + 1, COLUMNS - 2) + 1):
+        if heights[x] < heights[x - 1] and heights[x] < heights[x + 1]:
+            wells += (heights[x - 1] - heights[x]) + (heights[x + 1] - heights[x])
+    return wells
+
+class FeatureCache:
+    def __init__(self, board):
+        if not isinstance(board, Bitboard):
+            board = Bitboard.from_field(board)
+        self.board = board
+        self.features = board_features(board)
+
+    def child_features(self, rotation, x_position, y):
+        # features of the board after locking the piece at (x_position, y), parent is not changed
+        min_dx, max_dx, masks = piece_rows(rotation)
+        shift = x_position + min_dx
+        rows = self.board.rows
+        full_row = (1 << COLUMNS) - 1
+        holes, lines_cleared, bumpiness, total_height, max_height, wells, row_transitions, col_transitions = self.features
+
+        # affected rows: row transitions and completed lines
+        for dy, mask in masks:
+            old_mask = rows[y + dy]
+            new_mask = old_mask | (mask << shift)
+            row_transitions += _ROW_TRANSITIONS[new_mask] - _ROW_TRANSITIONS[old_mask]
+            if new_mask == full_row:
+                lines_cleared += 1
+
+        # affected columns: heights, holes and column transitions
+        heights = self.board.heights
+        child_heights = list(heights)
+        for dx, top_dy, bottom_dy in piece_columns(rotation):
+            x = x_position + dx
+            bit = 1 << x
+            top, bottom = y + top_dy, y + bottom_dy
+            surface = ROWS - 1 - heights[x]
+            if bottom <= surface:
+                # on top of the column, the gap below becomes holes
+                holes += surface - bottom
+                child_heights[x] = ROWS - top
+            else:
+                # tucked into the holes of the column
+                holes -= bottom - top + 1
+
+            # only the cells just above and below the new segment can change transitions
+            above = 1 if top == 0 else (rows[top - 1] & bit) != 0
+            col_transitions += (1 - above) - above
+            if bottom + 1 < ROWS:
+                below = (rows[bottom + 1] & bit) != 0
+                col_transitions += (1 - below) - below
+
+        # the footprint is one block of columns
+        first, last = x_position + min_dx, x_position + max_dx
+        bumpiness += _bumpiness(child_heights, first, last) - _bumpiness(heights, first, last)
+        wells += _wells(child_heights, first, last) - _wells(heights, first, last)
+        for x in range(first, last + 1):
+            total_height += child_heights[x] - heights[x]
+            max_height = max(max_height, child_heights[x])
+
+        return [
+            holes,
+            lines_cleared,
+            bumpiness,
+            total_height,
+            max_height,
+            wells,
+            row_transitions,
+            col_transitions
+        ]
@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import queue
+import random
+import argparse
+import traceback
+import torch
+import torch.multiprocessing as mp
+
+# allow imports from root project folder and from dqn/ when imported as a module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+from models.dqn_model import DQN
+from replay_memory import ReplayMemory, PrioritizedReplayMemory
+from train_utils import train_step
+from vector_env import VectorEnv
+from train_dqn import (MAX_STEPS, EPSILON_START, EPSILON_END, EPSILON_DECAY, BATCH_SIZE, GAMMA,
+                       LEARNING_RATE, MEMORY_SIZE, PRIORITIZED_REPLAY, SAVE_PATH,
+                       load_models, load_ga_weights, select_moves)
+
+# actor/learner training: actor processes play headless games with a copy of the
+# weights and write transitions into shared-memory chunks, the learner process copies
+# full chunks into its replay memory and runs train_step without waiting for games.
+# every sync_interval train steps the learner publishes its weights, actors pick
+# them up before their next move.
+# python dqn/actor_learner.py --actors 7 --sync-interval 100
+
+NUM_ACTORS = max(1, (os.cpu_count() or 2) - 1)  # one core stays with the learner
+ENVS_PER_ACTOR = 4
+WEIGHT_SYNC_INTERVAL = 100  # train steps between weight updates for the actors
+TRAIN_STEPS = 50000
+TARGET_UPDATE_STEPS = 1000
+SAVE_EVERY = 5000
+
+# transition chunks: state, reward, next state, done in one row
+CHUNK_SIZE = 32
+CHUNKS_PER_ACTOR = 4
+STATE_SIZE = 8
+ROW_SIZE = 2 * STATE_SIZE + 2
+
+def pack(state, reward, next_state, done):
+    row = torch.empty(ROW_SIZE)
+    row[:STATE_SIZE] = state
+    row[STATE_SIZE] = reward
+    row[STATE_SIZE + 1:-1] = next_state
+    row[-1] = float(done)
+    return row
+
+def unpack(chunk):
+    # (states, rewards, next_states, dones) of a chunk, in ReplayMemory.push_batch order
+    return chunk[:, :STATE_SIZE], chunk[:, STATE_SIZE], chunk[:, STATE_SIZE + 1:-1], chunk[:, -1]
+
+def run_actor(errors, actor_id, *args):
+    # process entry point, a crash is sent to the learner with its traceback
+    try:
+        actor(actor_id, *args)
+    except BaseException:
+        errors.put((actor_id, traceback.format_exc()))
+        raise
+
+def actor(actor_id, shared_model, version, lock, chunks, free_chunks, full_chunks, results, stop, seed, num_envs):
+    # one core per process, the games are the work here
+    torch.set_num_threads(1)
+    random.seed(seed)
+
+    model = DQN()
+    local_version = -1
+    env = VectorEnv(num_envs, seed=seed, max_steps=MAX_STEPS)
+    ga_weights = load_ga_weights()
+    epsilon = EPSILON_START
+
+    chunk = None
+    filled = 0
+    while not stop.is_set():
+        # newest published weights
+        if version.value != local_version:
+            with lock:
+                model.load_state_dict(shared_model.state_dict())
+                local_version = version.value
+
+        choices = select_moves(model, env, epsilon, ga_weights)
+        states, actions, rewards, next_states, dones = env.step(choices)
+
+        for transition in zip(states, rewards, next_states, dones):
+            while chunk is None and not stop.is_set():
+                try:
+                    chunk = free_chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            if chunk is None:
+                return
+            chunks[chunk, filled] = pack(*transition)
+            filled += 1
+            if filled == CHUNK_SIZE:
+                full_chunks.put(chunk)
+                chunk = None
+                filled = 0
+
+        for steps, total_reward, lines in env.finished:
+            # decay exploration rate
+            if epsilon > EPSILON_END:
+                epsilon *= EPSILON_DECAY
+            results.put((actor_id, steps, total_reward, lines, epsilon))
+        env.finished.clear()
+
+def check_actors(actors, errors):
+    # a dead actor stops training, otherwise the learner would wait for its data forever
+    for actor_id, process in enumerate(actors):
+        if process.exitcode:
+            try:
+                _, message = errors.get(timeout=1)
+            except queue.Empty:
+                message = ''
+            raise RuntimeError(f"actor {actor_id} exited with code {process.exitcode}\n{message}")
+
+def train_distributed(num_actors=NUM_ACTORS, sync_interval=WEIGHT_SYNC_INTERVAL, train_steps=TRAIN_STEPS,
+                      envs_per_actor=ENVS_PER_ACTOR, save_path=SAVE_PATH, seed=None, prioritized=PRIORITIZED_REPLAY):
+    # returns the trained model, save_path=None skips the checkpoints
+    ctx = mp.get_context('spawn')
+    model, target_model = load_models()
+    optimizer = torch.optim.Adam(model.parameters(), lr=LEARNING_RATE)
+    memory = PrioritizedReplayMemory(MEMORY_SIZE) if prioritized else ReplayMemory(MEMORY_SIZE)
+
+    # weights the actors read, version counts the publishes
+    shared_model = DQN()
+    shared_model.load_state_dict(model.state_dict())
+    shared_model.share_memory()
+    version = ctx.Value('i', 0)
+    lock = ctx.Lock()
+
+    # every chunk is either free, being filled by an actor or full and waiting for the learner
+    num_chunks = num_actors * CHUNKS_PER_ACTOR
+    chunks = torch.zeros((num_chunks, CHUNK_SIZE, ROW_SIZE)).share_memory_()
+    free_chunks = ctx.Queue()
+    full_chunks = ctx.Queue()
+    for chunk in range(num_chunks):
+        free_chunks.put(chunk)
+    results = ctx.Queue()
+    errors = ctx.Queue()
+    stop = ctx.Event()
+
+    seeds = random.Random(seed)
+    actors = [ctx.Process(target=run_actor, args=(errors, i, shared_model, version, lock, chunks, free_chunks,
+                                                  full_chunks, results, stop, seeds.randrange(1 << 30), envs_per_actor))
+              for i in range(num_actors)]
+    for process in actors:
+        process.start()
+
+    episode = 0
+    step = 0
+    start = time.time()
+    try:
+        while step < train_steps:
+            check_actors(actors, errors)
+
+            # move every full chunk into the replay memory, wait while there is too little to train on
+            while True:
+                try:
+                    chunk = full_chunks.get(timeout=0.1 if len(memory) <= BATCH_SIZE else 0)
+                except queue.Empty:
+                    break
+                memory.push_batch(*unpack(chunks[chunk]))
+                free_chunks.put(chunk)
+
+            while not results.empty():
+                actor_id, steps, total_reward, lines, epsilon = results.get()
+                episode += 1
+                print(f"Episode {episode} (actor {actor_id}) | Steps: {steps} | Reward: {total_reward:.1f} | "
+                      f"Lines: {lines} | Epsilon: {epsilon:.3f} | Train steps: {step}")
+
+            if len(memory) <= BATCH_SIZE:
+                continue
+
+            train_step(model, target_model, memory, optimizer, batch_size=BATCH_SIZE, gamma=GAMMA, prioritized=prioritized)
+            step += 1
+
+            # publish the weights for the actors
+            if step % sync_interval == 0:
+                with lock:
+                    shared_model.load_state_dict(model.state_dict())
+                    version.value += 1
+
+            # sync target network
+            if step % TARGET_UPDATE_STEPS == 0:
+                target_model.load_state_dict(model.state_dict())
+
+            if save_path and step % SAVE_EVERY == 0:
+                torch.save(model.state_dict(), os.path.join(save_path, f"dqn_step{step}.pt"))
+                print(f"Model saved at step {step} ({step / (time.time() - start):.1f} train steps/s)")
+    finally:
+        stop.set()
+        for process in actors:
+            process.join()
+
+    return model
+
+def main():
+    parser = argparse.ArgumentParser(description='actor/learner DQN training')
+    parser.add_argument('--actors', type=int, default=NUM_ACTORS, help='actor processes')
+    parser.add_argument('--sync-interval', type=int, default=WEIGHT_SYNC_INTERVAL, help='train steps between weight syncs')
+    parser.add_argument('--envs', type=int, default=ENVS_PER_ACTOR, help='games per actor')
+    parser.add_argument('--steps', type=int, default=TRAIN_STEPS, help='train steps')
+    parser.add_argument('--prioritized', action='store_true', default=PRIORITIZED_REPLAY, help='prioritized experience replay')
+    args = parser.parse_args()
+    train_distributed(args.actors, args.sync_interval, args.steps, args.envs, prioritized=args.prioritized)
+
+if __name__ == "__main__":
+    main()
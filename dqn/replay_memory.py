@@ -1,16 +1,133 @@
 import random
-from collections import deque
+import torch
+import numpy as np
+
+# ring buffer of transitions in preallocated tensors. push writes one row at the
+# cursor, sample gathers a whole batch with one index per tensor.
+# the action is not stored, the value network only scores states
 
 class ReplayMemory:
     def __init__(self, capacity):
         self.capacity = capacity
-        self.memory = deque(maxlen=capacity)
+        self.position = 0
+        self.size = 0
+        self.states = None  # allocated on the first push, when the state size is known
+
+    def allocate(self, state):
+        self.states = torch.zeros((self.capacity,) + tuple(state.shape), dtype=torch.float32)
+        self.next_states = torch.zeros_like(self.states)
+        self.rewards = torch.zeros((self.capacity, 1), dtype=torch.float32)
+        self.dones = torch.zeros((self.capacity, 1), dtype=torch.float32)
 
     def push(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        if self.states is None:
+            self.allocate(state)
+        self.states[self.position] = state
+        self.next_states[self.position] = next_state
+        self.rewards[self.position, 0] = float(reward)
+        self.dones[self.position, 0] = float(done)
+
+        # overwrite the oldest transition once full
+        self.position = (self.position + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def push_batch(self, states, rewards, next_states, dones):
+        # many transitions at once, rewards and dones as flat tensors
+        if self.states is None:
+            self.allocate(states[0])
+        count = len(states)
+        index = (self.position + torch.arange(count)) % self.capacity
+        self.states[index] = states
+        self.next_states[index] = next_states
+        self.rewards[index, 0] = torch.as_tensor(rewards, dtype=torch.float32)
+        self.dones[index, 0] = torch.as_tensor(dones, dtype=torch.float32)
+
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
 
     def sample(self, batch_size):
-        return random.sample(self.memory, batch_size)
-    
+        # (states, rewards, next_states, dones) batches, rewards and dones as columns.
+        # random.sample over a range picks distinct indices without walking the buffer
+        index = torch.tensor(random.sample(range(self.size), batch_size))
+        return self.states[index], self.rewards[index], self.next_states[index], self.dones[index]
+
     def __len__(self):
-        return len(self.memory)
\ No newline at end of file
+        return self.size
+
+class SumTree:
+    # binary tree over the priorities, every node holds the sum of its children.
+    # leaves start at self.leaves, node i has children 2i and 2i + 1, the root is 1
+    def __init__(self, capacity):
+        self.leaves = 1
+        while self.leaves < capacity:
+            self.leaves *= 2
+        self.tree = np.zeros(2 * self.leaves)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, indices):
+        return self.tree[self.leaves + indices]
+
+    def update(self, indices, priorities):
+        # O(log n) per index, all indices of a level at once
+        nodes = self.leaves + np.asarray(indices)
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        # leaf index where the running sum of priorities passes each value
+        nodes = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        while nodes[0] < self.leaves:
+            left = 2 * nodes
+            go_right = values > self.tree[left]
+            values -= np.where(go_right, self.tree[left], 0)
+            nodes = left + go_right
+        return nodes - self.leaves
+
+class PrioritizedReplayMemory(ReplayMemory):
+    # transitions are drawn in proportion to priority ** alpha, priority being the
+    # last td error. importance-sampling weights undo the bias, beta grows to 1
+    # over beta_steps samples
+    def __init__(self, capacity, alpha=0.6, beta=0.4, beta_steps=100000, epsilon=1e-5):
+        super().__init__(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = (1 - beta) / beta_steps
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(capacity)
+
+    def push(self, state, action, reward, next_state, done):
+        # new transitions get the highest priority so far, each is seen at least once
+        self.tree.update([self.position], self.max_priority ** self.alpha)
+        super().push(state, action, reward, next_state, done)
+
+    def push_batch(self, states, rewards, next_states, dones):
+        index = (self.position + np.arange(len(states))) % self.capacity
+        self.tree.update(index, self.max_priority ** self.alpha)
+        super().push_batch(states, rewards, next_states, dones)
+
+    def sample(self, batch_size):
+        # (states, rewards, next_states, dones, weights, indices), weights as a column.
+        # one value per equal slice of the total priority
+        segment = self.tree.total() / batch_size
+        values = (np.arange(batch_size) + np.random.uniform(size=batch_size)) * segment
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+
+        probabilities = self.tree.get(indices) / self.tree.total()
+        weights = (self.size * probabilities) ** -self.beta
+        weights = torch.tensor(weights / weights.max(), dtype=torch.float32).unsqueeze(1)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        index = torch.from_numpy(indices)
+        return self.states[index], self.rewards[index], self.next_states[index], self.dones[index], weights, indices
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(np.asarray(td_errors, dtype=np.float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, priorities.max())
+        self.tree.update(indices, priorities ** self.alpha)
@@ -1,23 +1,23 @@
 import os
 import sys
 import json
+import argparse
 import torch
 import random
-import numpy as np
 
 # allow imports from root project folder
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from main import Main
-from ai_controller import get_valid_actions, get_lowest_valid_y, extract_features, evaluate_board
+from ai_controller import pick_best_action
 from models.dqn_model import DQN
-from replay_memory import ReplayMemory
+from replay_memory import ReplayMemory, PrioritizedReplayMemory
 from train_utils import train_step
-from settings import COLUMNS, ROWS, TETROMINOS
+from vector_env import VectorEnv, greedy_choices
 
 # config
 EPISODES = 500
 MAX_STEPS = 1000
+NUM_ENVS = 8  # games played side by side
 EPSILON_START = 0.8
 EPSILON_END = 0.1
 EPSILON_DECAY = 0.995
@@ -26,6 +26,7 @@ GAMMA = 0.99
 LEARNING_RATE = 0.0005
 MEMORY_SIZE = 10000
 TARGET_UPDATE_FREQ = 10
+PRIORITIZED_REPLAY = False  # sample transitions by td error instead of uniformly
 
 # paths
 SAVE_PATH = "models"
@@ -33,8 +34,8 @@ PRETRAINED_MODEL = os.path.join(SAVE_PATH, "easy/dqn_easy.pt")
 GA_WEIGHTS_PATH = "ga/saved_weights/best_weights_1748039070.json"
 os.makedirs(SAVE_PATH, exist_ok=True)
 
-def train_agent():
-    main = Main()
+def load_models():
+    # (model, target_model), both start from the pretrained weights when there are any
     model = DQN()
     target_model = DQN()
 
@@ -45,106 +46,79 @@ def train_agent():
         model.eval()
     else:
         target_model.load_state_dict(model.state_dict())
+    return model, target_model
 
+def load_ga_weights():
+    with open(GA_WEIGHTS_PATH, "r") as f:
+        return json.load(f)
+
+def select_moves(model, env, epsilon, ga_weights):
+    # one move index per game of the env: one batched forward pass for the greedy moves
+    features, offsets = env.candidates()
+    with torch.inference_mode():
+        values = model(torch.from_numpy(features)).squeeze(1).numpy()
+    choices = greedy_choices(values, offsets)
+
+    # epsilon-greedy action selection
+    for i in range(env.num_envs):
+        if random.random() < epsilon:
+            # use genetic algorithm to guide exploration instead of random moves
+            game = env.games[i].ai_game
+            action = pick_best_action(game.tetromino.shape, game.board, ga_weights, env.table)
+            moves = [move[:2] for move in env.moves[i]]
+            choices[i] = moves.index(action) if action in moves else random.randrange(len(moves))
+    return choices
+
+def train_agent(prioritized=PRIORITIZED_REPLAY):
+    model, target_model = load_models()
     optimizer = torch.optim.Adam(model.parameters(), lr=LEARNING_RATE)
-    memory = ReplayMemory(MEMORY_SIZE)
+    memory = PrioritizedReplayMemory(MEMORY_SIZE) if prioritized else ReplayMemory(MEMORY_SIZE)
     epsilon = EPSILON_START
 
+    # NUM_ENVS games in lockstep, one batched forward pass picks the moves of all of them.
+    # the env caches candidate features of boards seen before, q-values are not cached,
+    # the model changes every step
+    env = VectorEnv(NUM_ENVS, max_steps=MAX_STEPS)
+
     # load genetic algorithm weights
-    with open(GA_WEIGHTS_PATH, "r") as f:
-        ga_weights = json.load(f)
-
-    # training loop
-    for episode in range(EPISODES):
-        main.reset_game()
-        state = extract_features([[1 if cell else 0 for cell in row] for row in main.ai_game.field_data])
-        total_reward = 0
-        steps = 0
-
-        while not main.ai_game.game_over and steps < MAX_STEPS:
-            piece_type = main.ai_game.tetromino.shape
-            board = [[1 if cell else 0 for cell in row] for row in main.ai_game.field_data]
-            valid_actions = get_valid_actions(piece_type, board)
-
-            if not valid_actions:
-                break
-
-            # epsilon-greedy action selection
-            if random.random() < epsilon:
-                # use genetic algorithm to guide exploration instead of random moves
-                best_score = float('-inf')
-                best_action = None
-                for rot_idx, x_pos in valid_actions:
-                    rotation = TETROMINOS[piece_type]['rotations'][rot_idx]
-                    y = get_lowest_valid_y(rotation, x_pos, board)
-                    if y is None:
-                        continue
-                    temp_board = [row[:] for row in board]
-                    for dx, dy in rotation:
-                        px, py = x_pos + dx, y + dy
-                        if 0 <= px < COLUMNS and 0 <= py < ROWS:
-                            temp_board[py][px] = 1
-                    score = evaluate_board(temp_board, ga_weights)
-                    if score > best_score:
-                        best_score = score
-                        best_action = (rot_idx, x_pos)
-                action = best_action or random.choice(valid_actions)
-            else:
-                # use dqn to select best q-value move
-                q_values = []
-                actions = []
-                for (rot_idx, x_pos) in valid_actions:
-                    rotation = TETROMINOS[piece_type]['rotations'][rot_idx]
-                    y = get_lowest_valid_y(rotation, x_pos, board)
-                    if y is None:
-                        continue
-                    temp_board = [row[:] for row in board]
-                    for dx, dy in rotation:
-                        px, py = x_pos + dx, y + dy
-                        if 0 <= px < COLUMNS and 0 <= py < ROWS:
-                            temp_board[py][px] = 1
-                    features = extract_features(temp_board)
-                    with torch.no_grad():
-                        q = model(features.unsqueeze(0)).item()
-                    q_values.append(q)
-                    actions.append((rot_idx, x_pos))
-                action = actions[np.argmax(q_values)] if actions else random.choice(valid_actions)
-
-            # apply action to game
-            prev_lines = main.ai_score.lines
-            rot_idx, x_pos = action
-            main.ai_game.apply_action(piece_type, rot_idx, x_pos)
-
-            # get reward
-            lines_cleared = main.ai_score.lines - prev_lines
-            next_state = extract_features([[1 if cell else 0 for cell in row] for row in main.ai_game.field_data])
-            max_height = max([ROWS - y for y in range(ROWS) if any(board[y])]) if any(any(row) for row in board) else 0
-            reward = lines_cleared * 10 - 0.2 * max_height
-
-            # store experience
-            memory.push(state, action, reward, next_state, main.ai_game.game_over)
-
-            state = next_state
-            total_reward += reward
-            steps += 1
-
-            # train model if memory is large enough
-            if len(memory) > BATCH_SIZE:
-                loss = train_step(model, target_model, memory, optimizer, batch_size=BATCH_SIZE, gamma=GAMMA)
-
-        # sync target network
-        if episode % TARGET_UPDATE_FREQ == 0:
-            target_model.load_state_dict(model.state_dict())
-
-        # decay exploration rate
-        if epsilon > EPSILON_END:
-            epsilon *= EPSILON_DECAY
-
-        print(f"Episode {episode+1}/{EPISODES} | Steps: {steps} | Reward: {total_reward:.1f} | Epsilon: {epsilon:.3f}")
-
-        if (episode + 1) % 50 == 0:
-            torch.save(model.state_dict(), os.path.join(SAVE_PATH, f"dqn_ep{episode+1}.pt"))
-            print(f"Model saved at episode {episode+1}")
+    ga_weights = load_ga_weights()
+
+    # training loop, an episode is one finished game
+    episode = 0
+    while episode < EPISODES:
+        choices = select_moves(model, env, epsilon, ga_weights)
+
+        # apply the actions and store the experience
+        for transition in zip(*env.step(choices)):
+            memory.push(*transition)
+
+        # train model if memory is large enough, one update per placed piece
+        if len(memory) > BATCH_SIZE:
+            for _ in range(NUM_ENVS):
+                loss = train_step(model, target_model, memory, optimizer, batch_size=BATCH_SIZE, gamma=GAMMA,
+                                  prioritized=prioritized)
+
+        for steps, total_reward, lines in env.finished[:EPISODES - episode]:
+            episode += 1
+
+            # sync target network
+            if episode % TARGET_UPDATE_FREQ == 0:
+                target_model.load_state_dict(model.state_dict())
+
+            # decay exploration rate
+            if epsilon > EPSILON_END:
+                epsilon *= EPSILON_DECAY
+
+            print(f"Episode {episode}/{EPISODES} | Steps: {steps} | Reward: {total_reward:.1f} | Epsilon: {epsilon:.3f}")
+
+            if episode % 50 == 0:
+                torch.save(model.state_dict(), os.path.join(SAVE_PATH, f"dqn_ep{episode}.pt"))
+                print(f"Model saved at episode {episode}")
+        env.finished.clear()
 
 if __name__ == "__main__":
-    train_agent()
+    parser = argparse.ArgumentParser(description='DQN training')
+    parser.add_argument('--prioritized', action='store_true', default=PRIORITIZED_REPLAY,
+                        help='prioritized experience replay instead of uniform sampling')
+    args = parser.parse_args()
+    train_agent(args.prioritized)
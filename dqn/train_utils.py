@@ -2,13 +2,10 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
-def train_step(policy_net, target_net, replay_memory, optimizer, batch_size=64, gamma=0.99):
+def train_step(policy_net, target_net, replay_memory, optimizer, batch_size=64, gamma=0.99, prioritized=False):
+    # prioritized=True for a PrioritizedReplayMemory: weighted loss and new priorities
     batch = replay_memory.sample(batch_size)
-
-    state_batch = torch.stack([experience[0] for experience in batch])
-    reward_batch = torch.tensor([experience[2] for experience in batch], dtype=torch.float32).unsqueeze(1)
-    next_state_batch = torch.stack([experience[3] for experience in batch])
-    done_batch = torch.tensor([experience[4] for experience in batch], dtype=torch.float32).unsqueeze(1)
+    state_batch, reward_batch, next_state_batch, done_batch = batch[:4]
 
     # compute Q(s, a)
     q_values = policy_net(state_batch)
@@ -19,11 +16,20 @@ def train_step(policy_net, target_net, replay_memory, optimizer, batch_size=64,
         targets = reward_batch + gamma * target_q_values * (1 - done_batch)
 
     # loss = MSE between predicted and target Q-values
-    loss = nn.MSELoss()(q_values, targets)
+    if prioritized:
+        # importance-sampling weights scale every squared error
+        weights, indices = batch[4:]
+        loss = (weights * (q_values - targets) ** 2).mean()
+    else:
+        loss = nn.MSELoss()(q_values, targets)
 
     optimizer.zero_grad()
     loss.backward()
     optimizer.step()
 
+    # new priorities from the td errors of this batch
+    if prioritized:
+        replay_memory.update_priorities(indices, (targets - q_values).detach().squeeze(1).numpy())
+
     return loss.item()
 
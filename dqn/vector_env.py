@@ -0,0 +1,95 @@
+import numpy as np
+from game.headless import HeadlessMain
+from game.bag_generator import make_rng
+from ai_controller import extract_features, get_candidate_features
+from transposition import TranspositionTable
+
+# n independent headless games stepped in lockstep for DQN data collection.
+# candidates() stacks the afterstate features of every game into one array, so one
+# batched forward pass scores the moves of all games; step() places one piece in
+# every game and starts a new game wherever one ended
+
+MAX_STEPS = 1000
+
+class VectorEnv:
+    def __init__(self, num_envs, seed=None, max_steps=MAX_STEPS, table=None):
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.rng = make_rng(seed)
+        self.table = table if table is not None else TranspositionTable()
+
+        self.games = [HeadlessMain() for _ in range(num_envs)]
+        self.steps = [0] * num_envs
+        self.rewards = [0.0] * num_envs
+        self.states = [None] * num_envs
+        self.moves = [None] * num_envs
+        self.features = [None] * num_envs
+
+        # (steps, total reward, lines) of every game that ended since the last step
+        self.finished = []
+
+        for i in range(num_envs):
+            self.reset(i)
+
+    def reset(self, i):
+        # a fresh game with its own seed, repeatable when the env was seeded
+        self.games[i].reset_game(self.rng.randrange(1 << 30))
+        self.steps[i] = 0
+        self.rewards[i] = 0.0
+        self.refresh(i)
+
+    def refresh(self, i):
+        # state and candidate moves for the piece that is about to drop
+        game = self.games[i].ai_game
+        self.states[i] = extract_features(game.board)
+        self.moves[i], self.features[i] = get_candidate_features(game.tetromino.shape, game.board, self.table)
+
+    def candidates(self):
+        # (features, offsets): the moves of game i are rows offsets[i] to offsets[i + 1]
+        counts = [len(moves) for moves in self.moves]
+        offsets = np.zeros(self.num_envs + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        features = np.array([f for features in self.features for f in features], dtype=np.float32)
+        return features, offsets
+
+    def step(self, choices):
+        # choices[i] indexes self.moves[i]. returns (states, actions, rewards, next_states, dones),
+        # one entry per game, in ReplayMemory.push order; a finished game has already been
+        # replaced by a new one
+        states = list(self.states)
+        actions = []
+        rewards = []
+        next_states = []
+        dones = []
+
+        for i, choice in enumerate(choices):
+            main = self.games[i]
+            game = main.ai_game
+            rot_idx, x_pos, y = self.moves[i][choice]
+
+            prev_lines = main.ai_score.lines
+            max_height = max(game.board.heights)
+            game.apply_action(game.tetromino.shape, rot_idx, x_pos, y)
+            reward = (main.ai_score.lines - prev_lines) * 10 - 0.2 * max_height
+
+            self.steps[i] += 1
+            self.rewards[i] += reward
+            self.refresh(i)
+
+            # over when the next piece has nowhere to go. a game cut off at max_steps
+            # is restarted too, but is not done: its next state still has a value
+            done = not self.moves[i]
+            actions.append((rot_idx, x_pos))
+            rewards.append(reward)
+            next_states.append(self.states[i])
+            dones.append(done)
+
+            if done or self.steps[i] >= self.max_steps:
+                self.finished.append((self.steps[i], self.rewards[i], main.ai_score.lines))
+                self.reset(i)
+
+        return states, actions, rewards, next_states, dones
+
+def greedy_choices(values, offsets):
+    # index of the best move of every game, the first one wins ties
+    return [int(np.argmax(values[start:end])) for start, end in zip(offsets[:-1], offsets[1:])]
@@ -1,18 +1,27 @@
 import os
+import sys
 import json
-from main import Main
+
+# allow imports from root project folder, ahead of this folder so ga is the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.headless import HeadlessMain
 from ai_controller import pick_best_action
+from ga.ga import REACHABLE_MOVES
 
 NUM_TEST_GAMES = 5  
-WEIGHTS_FOLDER = "saved_weights"
+# every weight file plays the same seeded piece sequences
+BENCHMARK_SEEDS = list(range(NUM_TEST_GAMES))
+WEIGHTS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_weights")
 
 
-def evaluate_weights(weights):
+def evaluate_weights(weights, reachable=REACHABLE_MOVES):
+    # same move generator as the GA fitness (ga.evaluate_individual)
     total_lines = 0
     total_score = 0
-    for _ in range(NUM_TEST_GAMES):
-        main = Main()
-        main.reset_game()
+    main = HeadlessMain()
+    for seed in BENCHMARK_SEEDS:
+        main.reset_game(seed)
         main.ai_game.set_ai_weights(weights)
 
         max_steps = 1000
@@ -20,11 +29,9 @@ def evaluate_weights(weights):
 
         while not main.ai_game.game_over and steps < max_steps:
             piece_type = main.ai_game.tetromino.shape
-            board = [[1 if cell else 0 for cell in row] for row in main.ai_game.field_data]
-            action = pick_best_action(piece_type, board, weights)
+            action = pick_best_action(piece_type, main.ai_game.board, weights, reachable=reachable)
             if action:
-                rot_idx, x_pos = action
-                main.ai_game.apply_action(piece_type, rot_idx, x_pos)
+                main.ai_game.apply_action(piece_type, *action)
             steps += 1
 
         total_lines += main.ai_score.lines
@@ -1,5 +1,14 @@
+import os
+import sys
 import random
-from ai_controller import pick_best_action
+from multiprocessing import Pool
+
+# allow imports from root project folder
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai_controller import pick_best_action, pick_hold_action
+from game.headless import HeadlessMain
+from transposition import TranspositionTable
 import json
 import matplotlib.pyplot as plt 
 import time
@@ -15,6 +24,22 @@ GENE_LENGTH = 8
 WEIGHT_MIN = -10
 WEIGHT_MAX = 10
 
+# parallel fitness evaluation (1 = evaluate in this process)
+NUM_WORKERS = os.cpu_count() or 1
+
+# every individual plays the same seeded piece sequences, so fitness differences come from the weights
+FITNESS_SEEDS = [0, 1]
+
+# defaults for the move options, passed down from run_ga like the seeds.
+# reachable: search every spot reachable with shifts, rotations and soft drops
+# (game.move_search), False = only the lowest free spot per rotation and column.
+# hold: also try swapping in the held (or next) piece, always with reachable moves
+REACHABLE_MOVES = True
+HOLD_MOVES = False
+
+# outputs next to this file, whatever the working directory
+GA_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 def generate_individual():
     return [random.uniform(WEIGHT_MIN, WEIGHT_MAX) for _ in range(GENE_LENGTH)]
@@ -35,32 +60,86 @@ def tournament_selection(population, fitnesses):
     candidates.sort(key=lambda x: x[1], reverse=True)
     return candidates[0][0]
 
-def evaluate_individual(main_class, weights):
-    main_class.reset_game()
+def evaluate_individual(main_class, weights, seed=None, table=None, reachable=REACHABLE_MOVES, hold=HOLD_MOVES):
+    main_class.reset_game(seed)
     main_class.ai_game.set_ai_weights(weights)
 
     max_steps = 1000 # stop the test early for speed
     steps = 0
 
     while not main_class.ai_game.game_over and steps < max_steps:
-        piece_type = main_class.ai_game.tetromino.shape
-        board = [[1 if cell else 0 for cell in row] for row in main_class.ai_game.field_data]
-        action = pick_best_action(piece_type, board, weights)
+        game = main_class.ai_game
+        piece_type = game.tetromino.shape
+        if hold:
+            action = pick_hold_action(piece_type, game.hold_shape, main_class.ai_next_shapes[0], game.board, weights, table)
+            if action:
+                used_hold, *action = action
+                if used_hold and game.hold():
+                    piece_type = game.tetromino.shape
+        else:
+            action = pick_best_action(piece_type, game.board, weights, table, reachable)
         if action:
-            rot_idx, x_pos = action
-            main_class.ai_game.apply_action(piece_type, rot_idx, x_pos)
+            main_class.ai_game.apply_action(piece_type, *action)
         steps += 1
 
     return main_class.ai_score.lines + 0.1 * steps
 
-def run_ga(main_class):
+# every worker process keeps its own headless game and transposition table.
+# the seeded games start from the same boards for every individual, and elites replay theirs.
+# run_ga keeps one pool for the whole run so the tables survive between generations
+worker_main = None
+worker_table = None
+
+def evaluate_seeds(main_class, weights, seeds, table=None, reachable=REACHABLE_MOVES, hold=HOLD_MOVES):
+    # average fitness over the seeded games
+    return sum(evaluate_individual(main_class, weights, seed, table, reachable, hold) for seed in seeds) / len(seeds)
+
+def evaluate_job(job):
+    global worker_main, worker_table
+    if worker_main is None:
+        worker_main = HeadlessMain()
+        worker_table = TranspositionTable()
+    weights, seeds, reachable, hold = job
+    return evaluate_seeds(worker_main, weights, seeds, worker_table, reachable, hold)
+
+def evaluate_population(population, seeds=FITNESS_SEEDS, workers=NUM_WORKERS, main_class=None, pool=None,
+                        reachable=REACHABLE_MOVES, hold=HOLD_MOVES):
+    # same fitnesses in the same order for any number of workers.
+    # a given pool is reused, otherwise one is made for this call
+    jobs = [(weights, seeds, reachable, hold) for weights in population]
+    if pool is not None:
+        return pool.map(evaluate_job, jobs)
+    if workers > 1:
+        with Pool(min(workers, len(jobs))) as pool:
+            return pool.map(evaluate_job, jobs)
+
+    if main_class is None:
+        return [evaluate_job(job) for job in jobs]
+    table = TranspositionTable()
+    return [evaluate_seeds(main_class, weights, seeds, table, reachable, hold) for weights in population]
+
+def run_ga(main_class=None, workers=NUM_WORKERS, seed=None, reachable=REACHABLE_MOVES, hold=HOLD_MOVES):
+    # a passed in game instance is only used when evaluating in this process
+    if seed is not None:
+        random.seed(seed)
+
+    pool = Pool(min(workers, POPULATION_SIZE)) if workers > 1 else None
+    try:
+        best = evolve(main_class, workers, pool, reachable, hold)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return best
+
+def evolve(main_class, workers, pool, reachable, hold):
     fitness_history = []
     run_id = int(time.time())
     population = [generate_individual() for _ in range(POPULATION_SIZE)]
 
     for generation in range(NUM_GENERATIONS):
         print(f"\n--- Generation {generation} ---")
-        fitnesses = [evaluate_individual(main_class, ind) for ind in population]
+        fitnesses = evaluate_population(population, FITNESS_SEEDS, workers, main_class, pool, reachable, hold)
 
         best_fitness = max(fitnesses)
         fitness_history.append(best_fitness)
@@ -79,11 +158,11 @@ def run_ga(main_class):
 
         population = new_population
     plot_curve(run_id, fitness_history)
-    final_fitnesses = [evaluate_individual(main_class, ind) for ind in population]
+    final_fitnesses = evaluate_population(population, FITNESS_SEEDS, workers, main_class, pool, reachable, hold)
     best = population[final_fitnesses.index(max(final_fitnesses))]
 
     
-    filename = f"saved_weights/best_weights_{run_id}.json"
+    filename = os.path.join(GA_DIR, "saved_weights", f"best_weights_{run_id}.json")
     with open(filename, "w") as f:
         json.dump(best, f)
     print(f"\n🎯 Final best weights: {best}")
@@ -97,5 +176,8 @@ def plot_curve(run_id, fitness_history):
     plt.title("GA progress")
     plt.grid(True)
     plt.tight_layout()
-    plt.savefig(f"fitness_history/fitness_history_{run_id}.png")                          
+    plt.savefig(os.path.join(GA_DIR, "fitness_history", f"fitness_history_{run_id}.png"))                          
     print("📈  Fitness plot saved as fitness_history.png")
+
+if __name__ == "__main__":
+    run_ga()
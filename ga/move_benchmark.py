@@ -0,0 +1,63 @@
+import time
+from game.rules import TETROMINOS
+from game.headless import HeadlessMain
+from game.placements import generate_moves
+from game.move_search import reachable_moves
+from ai_controller import pick_best_action
+from ga.ga import evaluate_individual
+
+# compares the hard drop generator (game.placements) with the reachability search
+# (game.move_search): time per call on boards from seeded games, and a GA fitness
+# evaluation with each. run from the project root: python -m ga.move_benchmark
+
+BENCHMARK_SEEDS = [0, 1, 2]
+BOARDS_PER_SEED = 200
+BENCHMARK_WEIGHTS = [-4.93, 5.89, -2.68, -8.76, -1.89, 0.68, -10.67, -11.09]
+
+
+def collect_boards():
+    # boards from seeded games played with the benchmark weights
+    boards = []
+    main = HeadlessMain()
+    for seed in BENCHMARK_SEEDS:
+        main.reset_game(seed)
+        for _ in range(BOARDS_PER_SEED):
+            boards.append(main.ai_game.board.copy())
+            piece_type = main.ai_game.tetromino.shape
+            action = pick_best_action(piece_type, main.ai_game.board, BENCHMARK_WEIGHTS)
+            if action is None:
+                break
+            main.ai_game.apply_action(piece_type, *action)
+    return boards
+
+def time_generator(generator, boards):
+    # microseconds per call and placements per call
+    start = time.perf_counter()
+    placements = 0
+    for board in boards:
+        for piece_type in TETROMINOS:
+            placements += len(generator(piece_type, board))
+    calls = len(boards) * len(TETROMINOS)
+    return (time.perf_counter() - start) / calls * 1e6, placements / calls
+
+def time_fitness(reachable):
+    # one GA fitness evaluation over the benchmark seeds
+    main = HeadlessMain()
+    start = time.perf_counter()
+    fitness = sum(evaluate_individual(main, BENCHMARK_WEIGHTS, seed, reachable=reachable) for seed in BENCHMARK_SEEDS)
+    return time.perf_counter() - start, fitness / len(BENCHMARK_SEEDS)
+
+def run_benchmark():
+    boards = collect_boards()
+    print(f"\n Move generators on {len(boards)} boards x {len(TETROMINOS)} pieces\n")
+    for name, generator in [('hard drops', generate_moves), ('reachable', reachable_moves)]:
+        micros, placements = time_generator(generator, boards)
+        print(f"{name:>10}: {micros:7.1f} us/call, {placements:5.1f} placements/call")
+
+    print("\n GA fitness evaluation\n")
+    for name, reachable in [('hard drops', False), ('reachable', True)]:
+        seconds, fitness = time_fitness(reachable)
+        print(f"{name:>10}: {seconds:6.2f} s, fitness {fitness:.1f}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,15 +1,25 @@
 import random
-from settings import TETROMINOS
+from game.rules import TETROMINOS
+
+def make_rng(rng=None):
+    # rng: random.Random or int seed for a repeatable sequence, None uses the global random module
+    if rng is None:
+        return random
+    if isinstance(rng, int):
+        return random.Random(rng)
+    return rng
 
 class BagGenerator:
-    def __init__(self):
+    def __init__(self, rng=None):
+        self.rng = make_rng(rng)
+
         self.bag = []
         self._fill_bag()
 
     def _fill_bag(self):
         # one of each tetromino key, shuffled
         self.bag = list(TETROMINOS.keys())
-        random.shuffle(self.bag)
+        self.rng.shuffle(self.bag)
     
     def get_next(self):
         if not self.bag:
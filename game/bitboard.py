@@ -0,0 +1,173 @@
+from game.rules import COLUMNS, ROWS
+
+# every row of the field is one int, bit x set = column x filled
+FULL_ROW = (1 << COLUMNS) - 1
+
+# row masks and column footprints per rotation, built on first use
+_piece_rows = {}
+_piece_columns = {}
+
+def piece_rows(rotation):
+    # returns (min_dx, max_dx, [(dy, mask), ...]) with the masks shifted so min_dx is bit 0
+    key = tuple(rotation)
+    if key not in _piece_rows:
+        min_dx = min(dx for dx, dy in rotation)
+        max_dx = max(dx for dx, dy in rotation)
+        masks = {}
+        for dx, dy in rotation:
+            masks[dy] = masks.get(dy, 0) | (1 << (dx - min_dx))
+        _piece_rows[key] = (min_dx, max_dx, sorted(masks.items()))
+    return _piece_rows[key]
+
+def piece_columns(rotation):
+    # returns [(dx, top_dy, bottom_dy), ...], one entry per column the piece covers
+    key = tuple(rotation)
+    if key not in _piece_columns:
+        columns = sorted(set(dx for dx, dy in rotation))
+        _piece_columns[key] = [
+            (dx, min(dy for cx, dy in rotation if cx == dx), max(dy for cx, dy in rotation if cx == dx))
+            for dx in columns
+        ]
+    return _piece_columns[key]
+
+class Bitboard:
+    # rows: one bitmask per row, top row first
+    # heights: filled height of every column (0 = empty column)
+    # holes: empty cells below the top of every column
+    # only change a board through lock() and clear_full_rows(), they keep heights and holes up to date
+    __slots__ = ('rows', 'heights', 'holes')
+
+    def __init__(self, rows=None, heights=None, holes=None):
+        self.rows = list(rows) if rows is not None else [0] * ROWS
+        if heights is None:
+            self.heights = [0] * COLUMNS
+            self.holes = [0] * COLUMNS
+            for x in range(COLUMNS):
+                self.update_column(x)
+        else:
+            self.heights = list(heights)
+            self.holes = list(holes)
+
+    # conversions
+    @classmethod
+    def from_field(cls, field_data):
+        rows = []
+        for row in field_data:
+            mask = 0
+            for x, cell in enumerate(row):
+                if cell:
+                    mask |= 1 << x
+            rows.append(mask)
+        return cls(rows)
+
+    def to_field(self):
+        return [[(mask >> x) & 1 for x in range(COLUMNS)] for mask in self.rows]
+
+    def copy(self):
+        return Bitboard(self.rows, self.heights, self.holes)
+
+    def __eq__(self, other):
+        return isinstance(other, Bitboard) and self.rows == other.rows
+
+    def __hash__(self):
+        return hash(tuple(self.rows))
+
+    # column profile
+    def update_column(self, x):
+        # rescan one column from the top
+        bit = 1 << x
+        height = 0
+        holes = 0
+        for y, mask in enumerate(self.rows):
+            if mask & bit:
+                if not height:
+                    height = ROWS - y
+            elif height:
+                holes += 1
+        self.heights[x] = height
+        self.holes[x] = holes
+
+    def landing_y(self, rotation, x_position):
+        # hard drop row from the column heights, only exact when no footprint column has holes.
+        # returns False when a rescan is needed
+        y = ROWS
+        for dx, top_dy, bottom_dy in piece_columns(rotation):
+            x = x_position + dx
+            if self.holes[x]:
+                return False
+            y = min(y, ROWS - 1 - self.heights[x] - bottom_dy)
+        return y
+
+    # collisions
+    def collides(self, rotation, x_position, y):
+        min_dx, max_dx, masks = piece_rows(rotation)
+        if x_position + min_dx < 0 or x_position + max_dx >= COLUMNS:
+            return True
+
+        shift = x_position + min_dx
+        for dy, mask in masks:
+            row = y + dy
+            if not 0 <= row < ROWS:
+                return True
+            if self.rows[row] & (mask << shift):
+                return True
+        return False
+
+    def lowest_valid_y(self, rotation, x_position):
+        # same result as ai_controller.get_lowest_valid_y on the nested list board
+        min_dx, max_dx, masks = piece_rows(rotation)
+        if x_position + min_dx < 0 or x_position + max_dx >= COLUMNS:
+            return None
+
+        # without holes under the piece the lowest free spot is the hard drop spot
+        y = self.landing_y(rotation, x_position)
+        if y is not False:
+            return y if y + masks[0][0] >= 0 else None
+
+        shift = x_position + min_dx
+        shifted = [(dy, mask << shift) for dy, mask in masks]
+        rows = self.rows
+        for y in range(ROWS - 1 - masks[-1][0], -masks[0][0] - 1, -1):
+            for dy, mask in shifted:
+                if rows[y + dy] & mask:
+                    break
+            else:
+                return y
+        return None
+
+    # placing and clearing
+    def lock(self, rotation, x_position, y):
+        min_dx, max_dx, masks = piece_rows(rotation)
+        shift = x_position + min_dx
+        for dy, mask in masks:
+            row = y + dy
+            if 0 <= row < ROWS:
+                self.rows[row] |= mask << shift
+
+        # only the covered columns change
+        for dx, top_dy, bottom_dy in piece_columns(rotation):
+            x = x_position + dx
+            surface = ROWS - 1 - self.heights[x]
+            if 0 <= y + top_dy and y + bottom_dy <= surface:
+                # landed on top, new holes are the gap below the piece
+                self.holes[x] += surface - (y + bottom_dy)
+                self.heights[x] = ROWS - (y + top_dy)
+            else:
+                self.update_column(x)
+
+    def full_rows(self):
+        return [y for y, mask in enumerate(self.rows) if mask == FULL_ROW]
+
+    def clear_full_rows(self):
+        kept_rows = [mask for mask in self.rows if mask != FULL_ROW]
+        num_lines = ROWS - len(kept_rows)
+        if num_lines:
+            self.rows = [0] * num_lines + kept_rows
+
+            # solid columns just get shorter, columns with holes are rescanned
+            for x in range(COLUMNS):
+                if self.holes[x]:
+                    self.update_column(x)
+                else:
+                    self.heights[x] -= num_lines
+        return num_lines
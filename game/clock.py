@@ -0,0 +1,35 @@
+from pygame.time import get_ticks
+
+class WallClock:
+    # real milliseconds since pygame.init, the default for timers
+    def get_ticks(self):
+        return get_ticks()
+
+WALL_CLOCK = WallClock()
+
+class SimClock:
+    # simulated milliseconds, only moves when advance() is called.
+    # drives the game timers in fixed steps, so the same logic can run
+    # at a steady rate on screen or as fast as possible headless
+    def __init__(self, step, max_steps=None):
+        self.time = 0
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0
+
+    def get_ticks(self):
+        return self.time
+
+    def advance(self, ms=None):
+        self.time += self.step if ms is None else ms
+
+    def pending_steps(self, elapsed):
+        # number of fixed steps covering the elapsed real time, the rest carries over
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.step)
+        self.accumulator -= steps * self.step
+
+        # after a long stall drop the backlog instead of catching up all at once
+        if self.max_steps is not None and steps > self.max_steps:
+            steps = self.max_steps
+        return steps
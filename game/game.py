@@ -1,11 +1,13 @@
 from settings import *
-from random import choice
 from sys import exit
 from game.timer import Timer
+from game.clock import WALL_CLOCK
+from game.bag_generator import make_rng
+from interface.resources import get_tile
 from ai_controller import get_lowest_valid_y, get_valid_actions, evaluate_board, pick_best_action
 
 class Game: 
-    def __init__(self, main_instance, get_next_shape, update_score, topleft=(PADDING, PADDING)):
+    def __init__(self, main_instance, get_next_shape, update_score, topleft=(PADDING, PADDING), rng=None, clock=None):
 
         # general
         self.surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
@@ -23,28 +25,46 @@ class Game:
         # genetic algorithm
         self.ai_weights = None
 
+        # first piece, seeded when a repeatable game is needed
+        self.rng = make_rng(rng)
+
+        # timers and lock delay run on this clock, a SimClock steps them in fixed ticks
+        self.clock = clock or WALL_CLOCK
+
         # lines
         self.line_surface = self.surface.copy()
         self.line_surface.fill((0,255,0))
         self.line_surface.set_colorkey((0,255,0))
         self.line_surface.set_alpha(120)
+        self.draw_grid_lines()
+
+        # redraw only when the piece moved or the field changed
+        self.field_version = 0
+        self.drawn_key = None
+
+        # locked stack, rendered from field_data when the field changes
+        self.board_surface = self.surface.copy()
+        self.board_version = None
 
         # tetromino
+        # field_data holds the colour of every locked cell, 0 = empty.
+        # only the falling piece is made of sprites
         self.field_data = [[0 for x in range(COLUMNS)] for y in range(ROWS)]
         self.tetromino = Tetromino(
-            choice(list(TETROMINOS.keys())),self.sprites,
+            self.rng.choice(list(TETROMINOS.keys())),self.sprites,
             self.create_new_tetromino,
-            self.field_data)
+            self.field_data,
+            self.clock)
 
         # timer
         self.down_speed = UPDATE_START_SPEED
         self.down_speed_faster = self.down_speed * 0.3
         self.timers = {
-            'vertical move': Timer(self.down_speed, True, self.move_down),
-            'horizontal move': Timer(MOVE_WAIT_TIME),
-            'move down': Timer(MOVE_WAIT_TIME),
-            'rotate': Timer(ROTATE_WAIT_TIME),
-            'touch down': Timer(MOVE_WAIT_TIME)
+            'vertical move': Timer(self.down_speed, True, self.move_down, self.clock),
+            'horizontal move': Timer(MOVE_WAIT_TIME, clock=self.clock),
+            'move down': Timer(MOVE_WAIT_TIME, clock=self.clock),
+            'rotate': Timer(ROTATE_WAIT_TIME, clock=self.clock),
+            'touch down': Timer(MOVE_WAIT_TIME, clock=self.clock)
         }
         self.timers['vertical move'].activate()
 
@@ -73,17 +93,19 @@ class Game:
                 return True
         return False
 
-    def create_new_tetromino(self, game_over=False):
+    def create_new_tetromino(self, game_over=False, locked_rows=None):
+        self.field_version += 1
         if game_over:
             self.game_over = True
             return
 
-        self.check_finished_rows()
+        self.check_finished_rows(locked_rows)
         self.tetromino = Tetromino(
             self.get_next_shape(),
             self.sprites,
             self.create_new_tetromino,
-            self.field_data
+            self.field_data,
+            self.clock
     )
 
     def timer_update(self):
@@ -93,7 +115,8 @@ class Game:
     def move_down(self):
         self.tetromino.move_down()
 
-    def draw_grid(self):
+    def draw_grid_lines(self):
+        # static layer, drawn once
         for col in range (1, COLUMNS):
             x = col * CELL_SIZE
             pygame.draw.line(self.line_surface, LINE_COLOR, (x,0),(x,self.surface.get_height()),1)
@@ -102,6 +125,7 @@ class Game:
             y = row * CELL_SIZE
             pygame.draw.line(self.line_surface, LINE_COLOR, (0,y),(self.surface.get_width(),y),1)
 
+    def draw_grid(self):
         self.surface.blit(self.line_surface, (0,0))
 
     def input(self, event):
@@ -135,34 +159,33 @@ class Game:
             self.main.stats['total_player_moves'] += 1
             self.timers['move down'].activate()
 
-    def check_finished_rows(self):
-        # get row indexes
-        delete_rows = []
-        for i, row in enumerate(self.field_data):
-            if all(row):
-                delete_rows.append(i)
+    def check_finished_rows(self, rows=None):
+        # only the rows the locked piece touched can be full, None checks the whole field
+        if rows is None:
+            rows = range(ROWS)
+        delete_rows = sorted(y for y in set(rows) if 0 <= y < ROWS and all(self.field_data[y]))
 
         if delete_rows:
-            for delete_row in delete_rows:
-                # delete full rows
-                for block in self.field_data[delete_row]:
-                    block.kill()
-                
-                # move down blocks
-                for row in self.field_data:
-                    for block in row:
-                        if block and block.pos.y < delete_row:
-                            block.pos.y += 1
-
-            # rebuild the field data
-            self.field_data = [[0 for x in range(COLUMNS)] for y in range(ROWS)]
-            for block in self.sprites:
-                self.field_data[int(block.pos.y)][int(block.pos.x)] = block
+            # compact in place from the lowest full row up, so the list shared with the tetromino stays valid
+            write = delete_rows[-1]
+            for read in range(delete_rows[-1], -1, -1):
+                if read not in delete_rows:
+                    self.field_data[write] = self.field_data[read]
+                    write -= 1
+
+            # empty rows come in on top
+            for y in range(write + 1):
+                self.field_data[y] = [0 for x in range(COLUMNS)]
 
             # update score
             self.calculate_score(len(delete_rows))
     
-    def run(self, events):
+    def run(self, events, force=True):
+        self.handle_input(events)
+        self.update()
+        return self.draw(force)
+
+    def handle_input(self, events):
         # handle single-tap keys (rotation, hard drop)
         if self.accept_input:
             for event in events:
@@ -184,11 +207,21 @@ class Game:
                 self.main.stats['total_player_moves'] += 1
                 self.timers['move down'].activate()
 
+    def update(self):
+        # one simulation step
         self.timer_update()
         self.sprites.update()
 
+    def draw(self, force=True):
+        # returns the screen rect that was redrawn, None when nothing changed
+        draw_key = (self.field_version, tuple((block.pos.x, block.pos.y) for block in self.tetromino.blocks))
+        if not force and draw_key == self.drawn_key:
+            return None
+        self.drawn_key = draw_key
+
         # drawing
-        self.surface.fill(GRAY)
+        self.draw_board()
+        self.surface.blit(self.board_surface, (0,0))
         ghost_positions = self.tetromino.get_ghost_position()
         for pos in ghost_positions:
             rect = pygame.Rect(pos.x * CELL_SIZE, pos.y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
@@ -198,10 +231,25 @@ class Game:
         self.draw_grid()
         self.display_surface.blit(self.surface, self.rect.topleft)
         pygame.draw.rect(self.display_surface, LINE_COLOR, self.rect, 2, 2)
+        return self.rect
 
-    def apply_action(self, piece_type, rotation_index, x_pos):
+    def draw_board(self):
+        # the locked stack only changes when a piece locks
+        if self.board_version == self.field_version:
+            return
+        self.board_version = self.field_version
+
+        self.board_surface.fill(GRAY)
+        for y, row in enumerate(self.field_data):
+            for x, color in enumerate(row):
+                if color:
+                    self.board_surface.blit(get_tile(color, CELL_SIZE), (x * CELL_SIZE, y * CELL_SIZE))
+
+    def apply_action(self, piece_type, rotation_index, x_pos, y=None):
+        # without y the piece goes to the lowest free spot of its column
         rotation = TETROMINOS[piece_type]['rotations'][rotation_index]
-        y = get_lowest_valid_y(rotation, x_pos, self.field_data)
+        if y is None:
+            y = get_lowest_valid_y(rotation, x_pos, self.field_data)
 
         if y is None:
             return
@@ -213,19 +261,16 @@ class Game:
             px = x_pos + dx
             py = y + dy
             if 0 <= px < COLUMNS and 0 <= py < ROWS:
-                block = Block(self.sprites, (0, 0), TETROMINOS[piece_type]['color'])
-                block.pos = pygame.Vector2(px, py)
-                block.update() 
-                self.field_data[py][px] = block
+                self.field_data[py][px] = TETROMINOS[piece_type]['color']
 
-        self.create_new_tetromino()
+        self.create_new_tetromino(locked_rows=[y + dy for dx, dy in rotation])
 
     def set_ai_weights(self, weights):
         self.ai_weights = weights
 
         
 class Tetromino:
-    def __init__(self, shape, group, create_new_tetromino, field_data):
+    def __init__(self, shape, group, create_new_tetromino, field_data, clock=WALL_CLOCK):
 
         # setup
         self.shape = shape
@@ -233,6 +278,7 @@ class Tetromino:
         self.color = TETROMINOS[shape]['color']
         self.create_new_tetromino = create_new_tetromino
         self.field_data = field_data
+        self.clock = clock
 
         # piece locking
         self.lock_timer = 0
@@ -244,17 +290,51 @@ class Tetromino:
         # create blocks
         self.blocks = [Block(group, pos, self.color) for pos in self.block_positions]
 
-    def get_ghost_position(self):
-        ghost_positions = [block.pos.copy() for block in self.blocks]
+        # landing spot, the field does not change while this piece falls.
+        # column_tops is built once, the drop distance is reset on every move or rotation
+        self.column_tops = None
+        self.drop_distance = None
+        self.ghost_positions = None
+
+    def piece_moved(self):
+        self.drop_distance = None
+        self.ghost_positions = None
+
+    def get_column_tops(self):
+        # first filled row of every column, ROWS for an empty column
+        if self.column_tops is None:
+            self.column_tops = [ROWS] * COLUMNS
+            for x in range(COLUMNS):
+                for y in range(ROWS):
+                    if self.field_data[y][x]:
+                        self.column_tops[x] = y
+                        break
+        return self.column_tops
+
+    def get_drop_distance(self):
+        # rows the piece can fall, rows above the field count as empty
+        if self.drop_distance is None:
+            column_tops = self.get_column_tops()
+            drop = ROWS
+            for block in self.blocks:
+                x, y = int(block.pos.x), int(block.pos.y)
+                if y < column_tops[x]:
+                    # above the stack, lands straight on the column top
+                    drop = min(drop, column_tops[x] - 1 - y)
+                else:
+                    # under an overhang, scan down from the block
+                    distance = 0
+                    while y + distance + 1 < ROWS and not self.field_data[y + distance + 1][x]:
+                        distance += 1
+                    drop = min(drop, distance)
+            self.drop_distance = drop
+        return self.drop_distance
 
-        while True:
-            for pos in ghost_positions:
-                x, y = int(pos.x), int(pos.y + 1)
-                if y >= ROWS or self.field_data[y][x]:
-                    return ghost_positions  # stop if any part would collide
-            # move all ghost blocks down
-            for pos in ghost_positions:
-                pos.y += 1
+    def get_ghost_position(self):
+        if self.ghost_positions is None:
+            drop = self.get_drop_distance()
+            self.ghost_positions = [block.pos + (0, drop) for block in self.blocks]
+        return self.ghost_positions
 
     # collisions
     def next_move_horizontal_collide(self, blocks, amount):
@@ -270,41 +350,31 @@ class Tetromino:
         if not self.next_move_vertical_collide(self.blocks, 1):
             for block in self.blocks:
                 block.pos.y += 1
+            self.piece_moved()
             self.locking = False
             self.lock_resets = 0
         else:
             if not self.locking:
                 self.locking = True
-                self.lock_timer = pygame.time.get_ticks()
-            elif pygame.time.get_ticks() - self.lock_timer >= self.lock_delay:
+                self.lock_timer = self.clock.get_ticks()
+            elif self.clock.get_ticks() - self.lock_timer >= self.lock_delay:
                 self.force_lock()
     
     def move_horizontal(self, amount):
         if not self.next_move_horizontal_collide(self.blocks, amount):
             for block in self.blocks:
                 block.pos.x += amount
+            self.piece_moved()
 
             if self.locking:
                 self.lock_resets += 1
-                self.lock_timer = pygame.time.get_ticks()
+                self.lock_timer = self.clock.get_ticks()
                 if self.lock_resets >= self.max_lock_resets:
                     self.force_lock()
 
     def touch_down(self):
-        drop_distances = []
-
-        for block in self.blocks:
-            distance = 0
-            while True:
-                new_y = int(block.pos.y + distance + 1)
-                if new_y >= ROWS: 
-                    break
-                if new_y >= 0 and self.field_data[new_y][int(block.pos.x)]:
-                    break
-                distance += 1
-            drop_distances.append(distance)
-
-        min_drop = min(drop_distances)
+        # same landing spot as the ghost
+        min_drop = self.get_drop_distance()
 
         game_over = False
         for block in self.blocks:
@@ -313,9 +383,10 @@ class Tetromino:
                 game_over = True
             y, x = int(block.pos.y), int(block.pos.x)
             if y >= 0:
-                self.field_data[y][x] = block
+                self.field_data[y][x] = self.color
+            block.kill()
 
-        self.create_new_tetromino(game_over=game_over)
+        self.create_new_tetromino(game_over=game_over, locked_rows=[int(block.pos.y) for block in self.blocks])
 
     # rotate
     def rotate(self):
@@ -332,10 +403,11 @@ class Tetromino:
 
             for i, block in enumerate(self.blocks):
                 block.pos = new_block_positions[i]
+            self.piece_moved()
 
             if self.locking:
                 self.lock_resets += 1
-                self.lock_timer = pygame.time.get_ticks()
+                self.lock_timer = self.clock.get_ticks()
                 if self.lock_resets >= self.max_lock_resets:
                     self.force_lock()
 
@@ -343,17 +415,17 @@ class Tetromino:
         for block in self.blocks:
             y, x = int(block.pos.y), int(block.pos.x)
             if y >= 0:
-                self.field_data[y][x] = block
+                self.field_data[y][x] = self.color
+            block.kill()
         game_over = any(block.pos.y < 0 for block in self.blocks)
-        self.create_new_tetromino(game_over=game_over)
+        self.create_new_tetromino(game_over=game_over, locked_rows=[int(block.pos.y) for block in self.blocks])
 
 class Block(pygame.sprite.Sprite):
     def __init__(self, group, pos, color):
 
         # general
         super().__init__(group)
-        self.image = pygame.Surface((CELL_SIZE,CELL_SIZE))
-        self.image.fill(color)
+        self.image = get_tile(color, CELL_SIZE)
 
         # position
         self.pos = pygame.Vector2(pos) + BLOCK_OFFSET
@@ -0,0 +1,148 @@
+from game.rules import *
+from game.bag_generator import BagGenerator, make_rng
+from game.bitboard import Bitboard
+from ai_controller import get_lowest_valid_y
+
+# pygame-free version of Game for training and benchmarks.
+# gives the same placements, line clears, score and levels as Game.apply_action,
+# but stores the field as a Bitboard instead of Block sprites and never draws anything
+
+class HeadlessGame:
+    def __init__(self, get_next_shape, update_score=None, rng=None):
+
+        # general
+        self.game_over = False
+        self.accept_input = False
+
+        # game connection
+        self.get_next_shape = get_next_shape
+        self.update_score = update_score
+
+        # genetic algorithm
+        self.ai_weights = None
+
+        # first piece, seeded when a repeatable game is needed
+        self.rng = make_rng(rng)
+
+        # tetromino
+        self.board = Bitboard()
+        self.tetromino = HeadlessTetromino(self.rng.choice(list(TETROMINOS.keys())))
+        self.hold_shape = None
+        self.can_hold = True  # once per piece, until it locks
+
+        # score
+        self.current_level = 1
+        self.current_score = 0
+        self.current_lines = 0
+
+    @property
+    def field_data(self):
+        # nested list view, same layout as Game.field_data
+        return self.board.to_field()
+
+    def calculate_score(self, num_lines):
+        self.current_lines += num_lines
+        self.current_score += SCORE_DATA[num_lines] * self.current_level
+
+        # level up every 10 lines
+        if self.current_lines/10 > self.current_level:
+            self.current_level += 1
+
+        if self.update_score:
+            self.update_score(self.current_lines, self.current_score, self.current_level)
+
+    def create_new_tetromino(self, game_over=False):
+        if game_over:
+            self.game_over = True
+            return
+
+        self.check_finished_rows()
+        self.tetromino = HeadlessTetromino(self.get_next_shape())
+        self.can_hold = True
+
+    def check_finished_rows(self):
+        num_lines = self.board.clear_full_rows()
+        if num_lines:
+            self.calculate_score(num_lines)
+
+    def apply_action(self, piece_type, rotation_index, x_pos, y=None):
+        # without y the piece goes to the lowest free spot of its column
+        rotation = TETROMINOS[piece_type]['rotations'][rotation_index]
+        if y is None:
+            y = get_lowest_valid_y(rotation, x_pos, self.board)
+
+        if y is None:
+            return
+
+        self.board.lock(rotation, x_pos, y)
+        self.create_new_tetromino()
+
+    def hold(self):
+        # swap the current piece with the held one, an empty slot takes the next piece.
+        # False when this piece was already swapped
+        if not self.can_hold:
+            return False
+        held_shape = self.hold_shape
+        self.hold_shape = self.tetromino.shape
+        self.tetromino = HeadlessTetromino(held_shape or self.get_next_shape())
+        self.can_hold = False
+        return True
+
+    def set_ai_weights(self, weights):
+        self.ai_weights = weights
+
+
+class HeadlessTetromino:
+    def __init__(self, shape):
+        self.shape = shape
+        self.color = TETROMINOS[shape]['color']
+
+
+class HeadlessScore:
+    def __init__(self):
+        self.score = 0
+        self.level = 1
+        self.lines = 0
+
+
+class HeadlessMain:
+    # stands in for main.Main in the GA, benchmark and DQN loops:
+    # same reset_game / ai_game / ai_score interface, no window
+    def __init__(self):
+        self.stats = {'total_ai_moves': 0, 'total_ai_lines': 0, 'total_ai_tetrises': 0}
+        self.prev_ai_lines = 0
+        self.reset_game()
+
+    def update_ai_score(self, lines, score, level):
+        self.ai_score.lines = lines
+        self.ai_score.score = score
+        self.ai_score.level = level
+
+        # track line clears and tetrises
+        delta = lines - self.prev_ai_lines
+        if delta > 0:
+            self.stats['total_ai_lines'] += delta
+            if delta == 4:
+                self.stats['total_ai_tetrises'] += 1
+        self.prev_ai_lines = lines
+
+    def get_ai_next_shape(self):
+        next_shape = self.ai_next_shapes.pop(0)
+        self.ai_next_shapes.append(self.ai_bag.get_next())
+        return next_shape
+
+    def reset_game(self, seed=None):
+        # the same seed always gives the same piece sequence
+        rng = make_rng(seed)
+
+        # shapes queue
+        self.ai_bag = BagGenerator(rng)
+        self.ai_next_shapes = [self.ai_bag.get_next() for _ in range(3)]
+
+        self.ai_game = HeadlessGame(self.get_ai_next_shape, self.update_ai_score, rng)
+        self.ai_score = HeadlessScore()
+
+        # reset stats
+        for k in self.stats:
+            self.stats[k] = 0
+        self.prev_ai_lines = 0
@@ -0,0 +1,190 @@
+from game.rules import COLUMNS, ROWS, TETROMINOS
+from game.bitboard import Bitboard
+
+# every placement a piece can reach from the spawn by shifting, rotating and soft
+# dropping, including slides and tucks under overhangs that a hard drop misses.
+# the search runs row by row from the top: inside a row the reachable anchors of
+# every rotation are one bitset each (the visited set), grown by shifts and rotations
+# until nothing changes, then moved one row down through the free anchors.
+# there is no move up, so one pass from top to bottom visits every state
+
+SPAWN_X = COLUMNS // 2
+
+def fill_runs(seeds, free):
+    # every bit of free connected to a seed through free bits, in both directions.
+    # occluded (Kogge-Stone) fill, log2(COLUMNS) steps instead of one per column
+    left = right = seeds
+    left_free = right_free = free
+    shift = 1
+    while shift < COLUMNS:
+        left |= left_free & (left << shift)
+        left_free &= left_free << shift
+        right |= right_free & (right >> shift)
+        right_free &= right_free >> shift
+        shift *= 2
+    return left | right
+
+class RotationState:
+    def __init__(self, rotation_index, rotation):
+        self.rotation_index = rotation_index
+        self.rotation = rotation
+
+        self.min_dx = min(dx for dx, dy in rotation)
+        self.width = max(dx for dx, dy in rotation) - self.min_dx + 1
+        self.min_dy = min(dy for dx, dy in rotation)
+        self.max_dy = max(dy for dx, dy in rotation)
+
+        # per covered row: the column offsets of its cells, counted from min_dx
+        offsets = {}
+        for dx, dy in rotation:
+            offsets.setdefault(dy, []).append(dx - self.min_dx)
+        self.row_offsets = sorted(offsets.items())
+
+        # shifts that keep every cell on the board
+        self.shift_range = (1 << (COLUMNS - self.width + 1)) - 1
+
+        # cells shifted to the top-left corner, identical shapes share a key
+        self.key = frozenset((dx - self.min_dx, dy - self.min_dy) for dx, dy in rotation)
+
+        # every shift, for rows above the stack
+        self.all_anchors = self.shift_range << -self.min_dx
+
+    def free_anchors(self, rows, y, stack_top):
+        # bitset of anchor x where this rotation fits with its anchor on row y
+        if y + self.min_dy < 0 or y + self.max_dy >= ROWS:
+            return 0
+        if y + self.max_dy < stack_top:
+            return self.all_anchors
+        blocked = 0
+        for dy, offsets in self.row_offsets:
+            row = rows[y + dy]
+            for offset in offsets:
+                blocked |= row >> offset
+        # the anchor is -min_dx columns right of the shift, min_dx is never positive
+        return (~blocked & self.shift_range) << -self.min_dx
+
+def build_rotation_states():
+    # rotations covering the same cells around the same anchor (all of O) are one state,
+    # turns lists the states one rotation away in either direction
+    states = {}
+    for piece_type, data in TETROMINOS.items():
+        rotations = data['rotations']
+        unique = []
+        index_of = []
+        for rotation_index, rotation in enumerate(rotations):
+            cells = frozenset(rotation)
+            for i, state in enumerate(unique):
+                if frozenset(state.rotation) == cells:
+                    index_of.append(i)
+                    break
+            else:
+                index_of.append(len(unique))
+                unique.append(RotationState(rotation_index, rotation))
+
+        count = len(rotations)
+        turns = [set() for _ in unique]
+        for rotation_index in range(count):
+            for step in (1, -1):
+                target = index_of[(rotation_index + step) % count]
+                if target != index_of[rotation_index]:
+                    turns[index_of[rotation_index]].add(target)
+        states[piece_type] = (unique, [sorted(t) for t in turns])
+    return states
+
+ROTATION_STATES = build_rotation_states()
+
+def search_rows(states, turns, free, reach, first_y):
+    # fills reach[state][y] for every row from first_y down
+    for y in range(first_y, ROWS):
+        # shifts and rotations inside the row until nothing new is reached
+        pending = [i for i in range(len(states)) if reach[i][y]]
+        while pending:
+            i = pending.pop()
+            reached = reach[i][y]
+            if reached != free[i][y]:
+                reached = fill_runs(reached, free[i][y])
+                reach[i][y] = reached
+
+            for j in turns[i]:
+                new = reached & free[j][y] & ~reach[j][y]
+                if new:
+                    reach[j][y] |= new
+                    pending.append(j)
+
+        # soft drop
+        if y + 1 < ROWS:
+            for i in range(len(states)):
+                reach[i][y + 1] |= reach[i][y] & free[i][y + 1]
+
+def empty_board_reach(piece_type):
+    # reachable anchors on an empty board, the same as above any stack
+    states, turns = ROTATION_STATES[piece_type]
+    free = [[state.free_anchors([0] * ROWS, y, ROWS) for y in range(ROWS)] for state in states]
+    reach = [[0] * ROWS for _ in states]
+    start_y = -states[0].min_dy
+    reach[0][start_y] = 1 << SPAWN_X
+    search_rows(states, turns, free, reach, start_y)
+    return reach
+
+EMPTY_REACH = {piece_type: empty_board_reach(piece_type) for piece_type in TETROMINOS}
+
+def reachable_moves(piece_type, board):
+    # every reachable resting spot as (rotation_index, x, y), sorted, each cell set once.
+    # empty when the piece cannot spawn
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_field(board)
+    rows = board.rows
+    states, turns = ROTATION_STATES[piece_type]
+
+    stack_top = next((y for y, mask in enumerate(rows) if mask), ROWS)
+    free = [[state.free_anchors(rows, y, stack_top) for y in range(ROWS)] for state in states]
+
+    # spawn in the first rotation, as high as the whole piece is on the board
+    start_y = -states[0].min_dy
+    if not free[0][start_y] >> SPAWN_X & 1:
+        return []
+
+    # rows where every rotation is still above the stack are copied from the empty board,
+    # the search starts where the stack begins
+    sky_rows = max(stack_top - max(state.max_dy for state in states), start_y)
+    reach = [row[:sky_rows] + [0] * (ROWS - sky_rows) for row in EMPTY_REACH[piece_type]]
+    if sky_rows == start_y:
+        reach[0][start_y] = 1 << SPAWN_X
+    elif sky_rows < ROWS:
+        for i in range(len(states)):
+            reach[i][sky_rows] = reach[i][sky_rows - 1] & free[i][sky_rows]
+    search_rows(states, turns, free, reach, sky_rows)
+
+    # resting spots: reached, and one row lower does not fit
+    moves = []
+    seen = set()
+    for i, state in enumerate(states):
+        for y in range(ROWS):
+            resting = reach[i][y] & ~(free[i][y + 1] if y + 1 < ROWS else 0)
+            x = 0
+            while resting:
+                if resting & 1:
+                    # final-placement cache, the same cells from another rotation are skipped
+                    key = (state.key, x + state.min_dx, y + state.min_dy)
+                    if key not in seen:
+                        seen.add(key)
+                        moves.append((state.rotation_index, x, y))
+                resting >>= 1
+                x += 1
+    moves.sort()
+    return moves
+
+def hold_pieces(piece_type, hold_type, next_type):
+    # [(used_hold, piece_type)]: the current piece and the piece hold would swap in,
+    # the held piece or the next one while the slot is empty
+    pieces = [(False, piece_type)]
+    swap_type = hold_type or next_type
+    if swap_type and swap_type != piece_type:
+        pieces.append((True, swap_type))
+    return pieces
+
+def hold_moves(piece_type, hold_type, next_type, board):
+    # (used_hold, rotation_index, x, y) for every piece of hold_pieces
+    return [(used_hold,) + move
+            for used_hold, hold_piece in hold_pieces(piece_type, hold_type, next_type)
+            for move in reachable_moves(hold_piece, board)]
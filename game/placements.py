@@ -0,0 +1,78 @@
+from game.rules import COLUMNS, ROWS, TETROMINOS
+from game.bitboard import Bitboard, piece_rows, piece_columns
+
+# placement data for every piece and rotation, built once at import.
+# rotations that cover the same cells (all of O, half of I/S/Z) are collapsed
+# into the first one, so each distinct landing spot is only generated once
+
+class Placement:
+    def __init__(self, rotation_index, rotation):
+        self.rotation_index = rotation_index
+        self.rotation = rotation
+
+        # x range that keeps every cell on the board
+        min_dx, max_dx, self.row_masks = piece_rows(rotation)
+        self.min_x = -min_dx
+        self.max_x = COLUMNS - 1 - max_dx
+
+        # vertical extent
+        self.min_dy = min(dy for dx, dy in rotation)
+        self.max_dy = max(dy for dx, dy in rotation)
+
+        # column footprint: (dx, top_dy, bottom_dy) per covered column
+        self.footprint = piece_columns(rotation)
+        self.columns = [dx for dx, top_dy, bottom_dy in self.footprint]
+        self.bottom = {dx: bottom_dy for dx, top_dy, bottom_dy in self.footprint}
+        self.top = {dx: top_dy for dx, top_dy, bottom_dy in self.footprint}
+
+        # cells shifted to the top-left corner, identical shapes share a key
+        self.key = frozenset((dx - min_dx, dy - self.min_dy) for dx, dy in rotation)
+
+def build_placements():
+    placements = {}
+    for piece_type, data in TETROMINOS.items():
+        seen = set()
+        placements[piece_type] = []
+        for rotation_index, rotation in enumerate(data['rotations']):
+            placement = Placement(rotation_index, rotation)
+            if placement.key in seen:
+                continue
+            seen.add(placement.key)
+            placements[piece_type].append(placement)
+    return placements
+
+PLACEMENTS = build_placements()
+
+def generate_moves(piece_type, board):
+    # every (rotation_index, x, landing_y) for the piece, in one pass
+    if not isinstance(board, Bitboard):
+        board = Bitboard.from_field(board)
+    rows = board.rows
+    heights = board.heights
+    holes = board.holes
+
+    moves = []
+    for placement in PLACEMENTS[piece_type]:
+        top_y = -placement.min_dy
+        for x in range(placement.min_x, placement.max_x + 1):
+            # no holes under the piece: land on the highest column surface
+            y = ROWS
+            for dx, top_dy, bottom_dy in placement.footprint:
+                if holes[x + dx]:
+                    break
+                y = min(y, ROWS - 1 - heights[x + dx] - bottom_dy)
+            else:
+                if y >= top_y:
+                    moves.append((placement.rotation_index, x, y))
+                continue
+
+            # otherwise the piece may fit lower down, scan up from the floor
+            shifted = [(dy, mask << (x - placement.min_x)) for dy, mask in placement.row_masks]
+            for y in range(ROWS - 1 - placement.max_dy, top_y - 1, -1):
+                for dy, mask in shifted:
+                    if rows[y + dy] & mask:
+                        break
+                else:
+                    moves.append((placement.rotation_index, x, y))
+                    break
+    return moves
@@ -0,0 +1,83 @@
+# board size 
+COLUMNS = 10
+ROWS = 20
+
+# colors 
+YELLOW = '#f1e60d'
+RED = '#e51b20'
+BLUE = '#204b9b'
+GREEN = '#65b32e'
+PURPLE = '#7b217f'
+CYAN = '#6cc6d9'
+ORANGE = '#f07e13'
+GRAY = '#1C1C1C'
+LINE_COLOR = '#FFFFFF'
+
+# shapes
+TETROMINOS = {
+	'T': {
+        'shape': [(0,0), (-1,0), (1,0), (0,-1)],
+        'rotations': [
+            [(0, 0), (-1, 0), (1, 0), (0, -1)],
+			[(0, 0), (0, 1), (0, -1), (-1, 0)],
+			[(0, 0), (1, 0), (-1, 0), (0, 1)],
+			[(0, 0), (0, -1), (0, 1), (1, 0)]
+        ],  
+        'color': PURPLE},
+	'O': {
+        'shape': [(0,0), (0,-1), (1,0), (1,-1)],
+        'rotations': [
+            [(0,0), (0,-1), (1,0), (1,-1)],
+			[(0,0), (0,-1), (1,0), (1,-1)],
+			[(0,0), (0,-1), (1,0), (1,-1)],
+			[(0,0), (0,-1), (1,0), (1,-1)]
+        ],   
+        'color': YELLOW},
+	'J': {
+        'shape': [(0,0), (0,-1), (0,1), (-1,1)],
+        'rotations': [
+            [(0, 0), (0, -1), (0, 1), (-1, 1)],
+			[(0, 0), (-1, 0), (1, 0), (1, 1)],
+			[(0, 0), (0, 1), (0, -1), (1, -1)],
+			[(0, 0), (1, 0), (-1, 0), (-1, -1)]
+        ],  
+        'color': BLUE},
+	'L': {
+        'shape': [(0,0), (0,-1), (0,1), (1,1)], 
+		'rotations': [
+            [(0, 0), (0, -1), (0, 1), (1, 1)],
+			[(0, 0), (-1, 0), (1, 0), (1, -1)],
+			[(0, 0), (0, 1), (0, -1), (-1, -1)],
+			[(0, 0), (1, 0), (-1, 0), (-1, 1)]
+        ], 
+        'color': ORANGE},
+	'I': {
+        'shape': [(0,0), (0,-1), (0,-2), (0,1)],
+        'rotations': [
+            [(0, 0), (0, -1), (0, -2), (0, 1)],
+			[(0, 0), (-1, 0), (-2, 0), (1, 0)],
+			[(0, 0), (0, 1), (0, 2), (0, -1)],
+			[(0, 0), (1, 0), (2, 0), (-1, 0)]
+        ],  
+        'color': CYAN},
+	'S': {
+        'shape': [(0,0), (-1,0), (0,-1), (1,-1)],
+        'rotations': [
+            [(0, 0), (-1, 0), (0, -1), (1, -1)],
+			[(0, 0), (0, 1), (-1, 0), (-1, -1)],
+			[(0, 0), (1, 0), (0, 1), (-1, 1)],
+			[(0, 0), (0, -1), (1, 0), (1, 1)]
+        ],   
+        'color': GREEN},
+	'Z': {
+        'shape': [(0,0), (1,0), (0,-1), (-1,-1)],
+        'rotations': [
+            [(0, 0), (1, 0), (0, -1), (-1, -1)],
+			[(0, 0), (0, -1), (-1, 0), (-1, 1)],
+			[(0, 0), (-1, 0), (0, 1), (1, 1)],
+			[(0, 0), (0, 1), (1, 0), (1, -1)]
+        ],    
+        'color': RED}
+}
+
+SCORE_DATA = {1: 40, 2: 100, 3: 300, 4: 1200}
\ No newline at end of file
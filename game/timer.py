@@ -1,28 +1,31 @@
-from pygame.time import get_ticks
+from game.clock import WALL_CLOCK
 
 class Timer:
-    def __init__(self, duration, repeated = False, func = None):
+    def __init__(self, duration, repeated = False, func = None, clock = None):
         self.repeated = repeated
         self.func = func
         self.duration = duration
 
+        # anything with get_ticks(), wall clock by default
+        self.clock = clock or WALL_CLOCK
+
         self.start_time = 0
         self.active = False
     
     def activate(self):
         self.active = True
-        self.start_time = get_ticks()
+        self.start_time = self.clock.get_ticks()
 
     def deactivate(self):
         self.active = False
         self.start_time = 0
 
     def update(self):
-        current_time = get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.start_time >= self.duration and self.active:
 
-            # call a function
-            if self.func and self.start_time != 0:
+            # call a function, a simulated clock can start at 0
+            if self.func:
                 self.func()
 
             # reset timer
@@ -31,4 +34,3 @@ class Timer:
             # repeat the timer
             if self.repeated:
                 self.activate()
-        
\ No newline at end of file
@@ -1,22 +1,22 @@
 import pygame
 from settings import *
-from os.path import join
+from interface.resources import asset_path, get_font, render_text
 from interface.start_screen import Button
 
 def draw_game_over_screen(main_instance, surface):
     # fonts for title and buttons
-    title_font = pygame.font.Font(join('assets', 'Russo_One.ttf'), 64)
-    menu_font = pygame.font.Font(join('assets', 'Russo_One.ttf'), 36)
+    title_font = get_font(asset_path('Russo_One.ttf'), 64)
+    menu_font = get_font(asset_path('Russo_One.ttf'), 36)
 
     # background
     surface.fill((20, 20, 20))
 
     # game over title
-    game_over_text = title_font.render("Game Over", True, 'red')
+    game_over_text = render_text(title_font, "Game Over", 'red')
     surface.blit(game_over_text, game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4)))
 
     # player’s score
-    score_text = menu_font.render(f"Final Score: {main_instance.player_score.score}", True, 'white')
+    score_text = render_text(menu_font, f"Final Score: {main_instance.player_score.score}", 'white')
     surface.blit(score_text, score_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4 + 60)))
 
     # button actions
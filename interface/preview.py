@@ -9,6 +9,7 @@ class Preview:
 
         # list of upcoming shapes
         self.next_shapes = next_shapes
+        self.drawn_shapes = None
 
     def draw_preview(self):
         self.surface.fill(GRAY)
@@ -48,7 +49,14 @@ class Preview:
                 pygame.draw.rect(self.surface, color, block_rect)
                 pygame.draw.rect(self.surface, 'black', block_rect, width=2)
 
-    def run(self):
-        self.display_surface.blit(self.surface, self.rect)
+    def run(self, force=True):
+        # only redraw when the queue changed
+        shapes = tuple(self.next_shapes)
+        if not force and shapes == self.drawn_shapes:
+            return None
+        self.drawn_shapes = shapes
+
         self.draw_preview()
+        self.display_surface.blit(self.surface, self.rect)
         pygame.draw.rect(self.display_surface, 'white', self.rect, width=2, border_radius=4)
+        return self.rect
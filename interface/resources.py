@@ -0,0 +1,66 @@
+import pygame
+from os.path import join
+
+# process-wide cache for images, fonts, rendered text and block tiles.
+# every screen asks here instead of loading from disk each frame
+
+MAX_TEXT_SURFACES = 512
+
+_images = {}
+_fonts = {}
+_texts = {}
+_tiles = {}
+
+def asset_path(name):
+    return join('assets', name)
+
+def get_image(path, alpha=False):
+    # loaded and converted once; needs the display mode to be set
+    key = (path, alpha)
+    if key not in _images:
+        image = pygame.image.load(path)
+        _images[key] = image.convert_alpha() if alpha else image.convert()
+    return _images[key]
+
+def get_font(path, size):
+    # path None gives pygame's default font, like pygame.font.SysFont(None, size)
+    key = (path, size)
+    if key not in _fonts:
+        _fonts[key] = pygame.font.Font(path, size)
+    return _fonts[key]
+
+def render_text(font, text, color, antialias=True):
+    # rendered text surfaces, reused while text and color stay the same
+    key = (font, text, str(color), antialias)
+    if key not in _texts:
+        if len(_texts) >= MAX_TEXT_SURFACES:
+            _texts.clear()
+        _texts[key] = font.render(text, antialias, color)
+    return _texts[key]
+
+def get_tile(color, size):
+    # one filled square per colour, shared by every block and the board renderer.
+    # never draw on the returned surface
+    key = (str(color), size)
+    if key not in _tiles:
+        tile = pygame.Surface((size, size))
+        tile.fill(color)
+        _tiles[key] = tile
+    return _tiles[key]
+
+def clear_cache(path=None):
+    # drop everything, or only the entries loaded from one file
+    global _texts
+    if path is None:
+        _images.clear()
+        _fonts.clear()
+        _texts.clear()
+        _tiles.clear()
+        return
+
+    for key in [key for key in _images if key[0] == path]:
+        del _images[key]
+    fonts = [font for key, font in _fonts.items() if key[0] == path]
+    for key in [key for key in _fonts if key[0] == path]:
+        del _fonts[key]
+    _texts = {key: text for key, text in _texts.items() if key[0] not in fonts}
@@ -1,5 +1,5 @@
 from settings import *
-from os.path import join
+from interface.resources import asset_path, get_font, render_text
 
 class Score:
     def __init__(self, topleft=(PADDING, PADDING)):
@@ -8,7 +8,7 @@ class Score:
         self.display_surface = pygame.display.get_surface()
 
         # font
-        self.font = pygame.font.Font(join('assets','Russo_One.ttf'), 30)
+        self.font = get_font(asset_path('Russo_One.ttf'), 30)
 
         # increment
         self.increment_height = self.surface.get_height() / 3
@@ -17,13 +17,20 @@ class Score:
         self.score = 0
         self.level = 1
         self.lines = 0
+        self.drawn_data = None
 
     def display_text(self, pos, text):
-        text_surface = self.font.render(f'{text[0]}: {text[1]}', True, 'white')
+        text_surface = render_text(self.font, f'{text[0]}: {text[1]}', 'white')
         text_rect = text_surface.get_rect(center = pos)
         self.surface.blit(text_surface, text_rect)
 
-    def run(self):
+    def run(self, force=True):
+        # only re-render the text when a value changed
+        data = (self.score, self.level, self.lines)
+        if not force and data == self.drawn_data:
+            return None
+        self.drawn_data = data
+
         self.surface.fill(GRAY)
         for i, text in enumerate([('Score', self.score), ('Level',self.level), ('Lines', self.lines)]):
             x = self.surface.get_width() / 2
@@ -31,3 +38,4 @@ class Score:
             self.display_text((x,y),text)
         self.display_surface.blit(self.surface, self.rect)
         pygame.draw.rect(self.display_surface, LINE_COLOR, self.rect, 2, 2)
+        return self.rect
@@ -1,8 +1,8 @@
 import pygame
 from settings import *
-from os.path import join
+from interface.resources import asset_path, get_font, get_image, render_text
 pygame.font.init()
-from models.dqn_model import set_agent_model
+from models.numpy_dqn import set_agent_model
 
 class Button:
     def __init__(self, text, center, font, action=None):
@@ -11,14 +11,14 @@ class Button:
         self.action = action
         self.color = 'white'
         self.hover_color = 'lightgray'
-        self.text_surface = self.font.render(self.text, True, self.color)
+        self.text_surface = render_text(self.font, self.text, self.color)
         self.rect = self.text_surface.get_rect(center=center)
         
     def draw(self, surface):
         mouse_pos = pygame.mouse.get_pos()
         is_hover = self.rect.collidepoint(mouse_pos)
         color = self.hover_color if is_hover else self.color
-        self.text_surface = self.font.render(self.text, True, color)
+        self.text_surface = render_text(self.font, self.text, color)
         surface.blit(self.text_surface, self.rect)
 
     def handle_event(self, event):
@@ -41,15 +41,15 @@ def show_credits():
     print("Created by Your Name - Your School")
 
 def draw_start_screen(main_instance, surface):
-    background_image = pygame.image.load(join('assets', 'background.png')).convert()
+    background_image = get_image(asset_path('background.png'))
     surface.blit(background_image, (0,0))
 
     # fonts
-    title_font = pygame.font.Font(join('assets', 'NeueHaasDisplayBlack.ttf'), 72)
-    menu_font = pygame.font.Font(join('assets', 'NeueHaasDisplayMediu.ttf'), 36)
+    title_font = get_font(asset_path('NeueHaasDisplayBlack.ttf'), 72)
+    menu_font = get_font(asset_path('NeueHaasDisplayMediu.ttf'), 36)
     
     # title
-    title_text = title_font.render("NEUROBLOCKS", True, 'white')
+    title_text = render_text(title_font, "NEUROBLOCKS", 'white')
     title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
     surface.blit(title_text, title_rect)
 
@@ -66,15 +66,15 @@ def draw_start_screen(main_instance, surface):
 
 def draw_difficulty_screen(main_instance, surface):
     # draw background
-    background_image = pygame.image.load(join('assets', 'background.png')).convert()
+    background_image = get_image(asset_path('background.png'))
     surface.blit(background_image, (0, 0))
 
     # fonts
-    title_font = pygame.font.Font(join('assets', 'NeueHaasDisplayBlack.ttf'), 64)
-    menu_font = pygame.font.Font(join('assets', 'NeueHaasDisplayMediu.ttf'), 36)
+    title_font = get_font(asset_path('NeueHaasDisplayBlack.ttf'), 64)
+    menu_font = get_font(asset_path('NeueHaasDisplayMediu.ttf'), 36)
 
     # title
-    title_text = title_font.render("Select Difficulty", True, 'white')
+    title_text = render_text(title_font, "Select Difficulty", 'white')
     title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 4))
     surface.blit(title_text, title_rect)
 
@@ -117,11 +117,11 @@ def draw_credits_screen(main_instance, surface):
     surface.fill((15, 15, 15))  # dark background
 
     # fonts
-    title_font = pygame.font.Font(join('assets', 'Russo_One.ttf'), 60)
-    text_font = pygame.font.Font(join('assets', 'Russo_One.ttf'), 28)
+    title_font = get_font(asset_path('Russo_One.ttf'), 60)
+    text_font = get_font(asset_path('Russo_One.ttf'), 28)
 
     # title
-    title_surf = title_font.render("Credits", True, 'white')
+    title_surf = render_text(title_font, "Credits", 'white')
     title_rect = title_surf.get_rect(center=(WINDOW_WIDTH // 2, 80))
     surface.blit(title_surf, title_rect)
 
@@ -139,7 +139,7 @@ def draw_credits_screen(main_instance, surface):
     ]
 
     for i, line in enumerate(lines):
-        line_surf = text_font.render(line, True, 'lightgray')
+        line_surf = render_text(text_font, line, 'lightgray')
         line_rect = line_surf.get_rect(center=(WINDOW_WIDTH // 2, 160 + i * 36))
         surface.blit(line_surf, line_rect)
 
@@ -1,19 +1,19 @@
 import pygame
 from settings import *
-from os.path import join
+from interface.resources import asset_path, get_font, render_text
 from interface.start_screen import Button
 
 def draw_stats_screen(main_instance, surface):
     # fonts
-    title_font  = pygame.font.Font(join('assets','Russo_One.ttf'), 64)
-    header_font = pygame.font.Font(join('assets','Russo_One.ttf'), 36)
-    text_font   = pygame.font.Font(join('assets','Russo_One.ttf'), 28)
+    title_font  = get_font(asset_path('Russo_One.ttf'), 64)
+    header_font = get_font(asset_path('Russo_One.ttf'), 36)
+    text_font   = get_font(asset_path('Russo_One.ttf'), 28)
 
     # background
     surface.fill((20, 20, 20))
 
     # main Title
-    title_surf = title_font.render("Statistics", True, 'white')
+    title_surf = render_text(title_font, "Statistics", 'white')
     title_rect = title_surf.get_rect(center=(WINDOW_WIDTH//2, 60))
     surface.blit(title_surf, title_rect)
 
@@ -21,8 +21,8 @@ def draw_stats_screen(main_instance, surface):
     col1_x = WINDOW_WIDTH // 4
     col2_x = WINDOW_WIDTH * 3 // 4
     y_col = title_rect.bottom + 20
-    player_hdr = header_font.render("Player", True, 'lightblue')
-    ai_hdr = header_font.render("AI",     True, 'lightblue')
+    player_hdr = render_text(header_font, "Player", 'lightblue')
+    ai_hdr = render_text(header_font, "AI",     'lightblue')
     surface.blit(player_hdr, player_hdr.get_rect(center=(col1_x, y_col)))
     surface.blit(ai_hdr,     ai_hdr.get_rect(center=(col2_x, y_col)))
 
@@ -46,7 +46,7 @@ def draw_stats_screen(main_instance, surface):
 
     # section: last game
     y_section = y_col + header_font.get_height() + 20
-    last_title = header_font.render("Last Game", True, (255, 215, 0))
+    last_title = render_text(header_font, "Last Game", (255, 215, 0))
     last_rect  = last_title.get_rect(center=(WINDOW_WIDTH//2, y_section))
     surface.blit(last_title, last_rect)
 
@@ -62,7 +62,7 @@ def draw_stats_screen(main_instance, surface):
         f"Tetrises: {last['player_tetrises']}"
     ]
     for i, txt in enumerate(pl_texts):
-        surf = text_font.render(txt, True, 'white')
+        surf = render_text(text_font, txt, 'white')
         rect = surf.get_rect(center=(col1_x, y_values + i * line_h))
         surface.blit(surf, rect)
 
@@ -75,13 +75,13 @@ def draw_stats_screen(main_instance, surface):
         f"Tetrises: {last['ai_tetrises']}"
     ]
     for i, txt in enumerate(ai_texts):
-        surf = text_font.render(txt, True, 'white')
+        surf = render_text(text_font, txt, 'white')
         rect = surf.get_rect(center=(col2_x, y_values + i * line_h))
         surface.blit(surf, rect)
 
     # section: averages
     y_avg_section = y_values + max(len(pl_texts), len(ai_texts)) * line_h + 40
-    avg_title = header_font.render("Average/Game", True, (0, 255, 127))
+    avg_title = render_text(header_font, "Average/Game", (0, 255, 127))
     avg_rect  = avg_title.get_rect(center=(WINDOW_WIDTH//2, y_avg_section))
     surface.blit(avg_title, avg_rect)
 
@@ -108,7 +108,7 @@ def draw_stats_screen(main_instance, surface):
         f"Tets/Games:  {avg_player_tets:.1f}"
     ]
     for i, txt in enumerate(p_avg_texts):
-        surf = text_font.render(txt, True, 'white')
+        surf = render_text(text_font, txt, 'white')
         rect = surf.get_rect(center=(col1_x, y_avg_values + i * line_h))
         surface.blit(surf, rect)
 
@@ -121,7 +121,7 @@ def draw_stats_screen(main_instance, surface):
         f"Tets/Games:  {avg_ai_tets:.1f}"
     ]
     for i, txt in enumerate(ai_avg_texts):
-        surf = text_font.render(txt, True, 'white')
+        surf = render_text(text_font, txt, 'white')
         rect = surf.get_rect(center=(col2_x, y_avg_values + i * line_h))
         surface.blit(surf, rect)
 
@@ -1,6 +1,5 @@
 from settings import *
 from sys import exit
-import torch
 import random
 import os
 import json
@@ -13,8 +12,14 @@ from interface.start_screen import draw_start_screen, draw_difficulty_screen, dr
 from interface.game_over_screen import draw_game_over_screen
 from interface.stats_screen import draw_stats_screen
 from game.bag_generator import BagGenerator
-from ai_controller import get_lowest_valid_y, get_valid_actions, extract_features
+from game.clock import SimClock
+from ai_controller import get_valid_actions
+from board_features import board_features
+from models.numpy_dqn import pick_numpy_action
+from ai_planner import plan_action, dqn_evaluator
+from transposition import TranspositionTable
 from ga.ga import run_ga
+from interface.resources import get_font, render_text
 
 class Main:
     def __init__(self):
@@ -22,10 +27,18 @@ class Main:
         pygame.init()
         self.display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         self.clock = pygame.time.Clock()
+        self.frame_time = 0
+        self.sim_clock = SimClock(SIM_STEP, MAX_SIM_STEPS)
         pygame.display.set_caption('NEUROBLOCKS')
         self.input_blocked_until = 0
         self.menu_buttons = []
 
+        # rendering
+        self.drawn_state = None
+        self.drawn_overlay = None
+        self.overlay = pygame.Surface((WINDOW_WIDTH // 2, WINDOW_HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 150))
+
         # ai timing control
         self.last_ai_move_time = 0
         self.player_lost_time = None
@@ -101,6 +114,16 @@ class Main:
     def reset_game(self):
         self.ai_move_delay = 1000
 
+        # game time restarts with every game
+        self.sim_clock = SimClock(SIM_STEP, MAX_SIM_STEPS)
+        self.last_ai_move_time = 0
+        self.player_lost_time = None
+
+        # ai features and q-values of boards seen before, one table each so the two
+        # kinds of entries don't evict each other. the agent is fixed for a game
+        self.ai_table = TranspositionTable()
+        self.ai_value_table = TranspositionTable()
+
         # shapes queue
         self.player_bag = BagGenerator()
         self.player_next_shapes = [self.player_bag.get_next() for _ in range(3)]
@@ -114,8 +137,8 @@ class Main:
         ai_gamefield_pos = (player_gamefield_pos[0] + GAME_WIDTH + PADDING * 2, PADDING)
         ai_sidebar_pos = (ai_gamefield_pos[0] + GAME_WIDTH + PADDING, PADDING)
 
-        self.player_game = Game(self, self.get_player_next_shape, self.update_player_score, topleft=player_gamefield_pos)
-        self.ai_game = Game(self, self.get_ai_next_shape, self.update_ai_score, topleft=ai_gamefield_pos)
+        self.player_game = Game(self, self.get_player_next_shape, self.update_player_score, topleft=player_gamefield_pos, clock=self.sim_clock)
+        self.ai_game = Game(self, self.get_ai_next_shape, self.update_ai_score, topleft=ai_gamefield_pos, clock=self.sim_clock)
 
         self.player_game.accept_input = True
         self.ai_game.accept_input = False
@@ -148,11 +171,8 @@ class Main:
         player_board = [[1 if cell else 0 for cell in row] for row in self.player_game.field_data]
         ai_board     = [[1 if cell else 0 for cell in row] for row in self.ai_game.field_data]
 
-        player_feats = extract_features(player_board)
-        ai_feats = extract_features(ai_board)
-
-        player_holes = int(player_feats[0].item())
-        ai_holes = int(ai_feats[0].item())
+        player_holes = int(board_features(player_board)[0])
+        ai_holes = int(board_features(ai_board)[0])
 
         entry = {
             'player_score': self.player_score.score,
@@ -205,8 +225,13 @@ class Main:
                         self.state = 'playing'
                         self.input_blocked_until = pygame.time.get_ticks() + 200
 
-            # draw main background
-            self.display_surface.fill(GRAY)
+            # draw main background, the play screen only repaints what changed
+            full_redraw = not DIRTY_RECT_RENDERING or self.state != self.drawn_state
+            if full_redraw or self.state != 'playing':
+                self.display_surface.fill(GRAY)
+                self.drawn_overlay = None
+            self.drawn_state = self.state
+            dirty_rects = None
 
             # draw main menu
             if self.state == 'main_menu':
@@ -220,101 +245,45 @@ class Main:
             elif self.state == 'playing':
                 # avoid instant placing after game start
                 if pygame.time.get_ticks() < self.input_blocked_until:
-                    self.player_game.run([])
+                    self.player_game.handle_input([])
                 else:
-                    self.player_game.run(events)
-
-                # run ai game logic
-                self.ai_game.run([])
-
-                # ai choose move
-                current_time = pygame.time.get_ticks()
-                if not self.ai_game.game_over and current_time - self.last_ai_move_time > self.ai_move_delay:
-                    piece_type = self.ai_game.tetromino.shape
-                    board = [[1 if cell else 0 for cell in row] for row in self.ai_game.field_data]
-                    valid_actions = get_valid_actions(piece_type, board)
-
-                    best_q = float('-inf')
-                    best_action = None
-
-                    for rot_idx, x_pos in valid_actions:
-                        rotation = TETROMINOS[piece_type]['rotations'][rot_idx]
-                        y = get_lowest_valid_y(rotation, x_pos, board)
-                        if y is None:
-                            continue
-                        temp_board = [row[:] for row in board]
-                        for dx, dy in rotation:
-                            px, py = x_pos + dx, y + dy
-                            if 0 <= px < COLUMNS and 0 <= py < ROWS:
-                                temp_board[py][px] = 1
-                        features = extract_features(temp_board)
-                        with torch.no_grad():
-                            q = self.agent(features.unsqueeze(0)).item()
-                        if q > best_q:
-                            best_q = q
-                            best_action = (rot_idx, x_pos)
-                    action = best_action
-
-                    # difficulty tweaking
-                    if self.difficulty == 'easy' and self.ai_game.current_level > 5:
-                        chance = self.ai_game.current_level / 15
-                        if random.random() < chance and valid_actions:
-                            action = random.choice(valid_actions)
-
-                    elif self.difficulty == 'medium' and self.ai_game.current_level > 15:
-                        chance = self.ai_game.current_level / 100
-                        if random.random() < chance and valid_actions:
-                            action = random.choice(valid_actions)
-
-                    # apply ai move
-                    if action:
-                        rot_idx, x_pos = action
-                        self.ai_game.apply_action(piece_type, rot_idx, x_pos)
-                        self.stats['total_ai_moves'] += 1
-                        self.last_ai_move_time = current_time
-
-                # draw UI 
-                self.player_score.run()
-                self.ai_score.run()
-                self.player_preview.run()
-                self.ai_preview.run()
-
-                # overlay if one player loses
-                overlay = pygame.Surface((WINDOW_WIDTH // 2, WINDOW_HEIGHT), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 150))
-                font = pygame.font.SysFont(None, 36)
-
+                    self.player_game.handle_input(events)
+
+                # game logic in fixed steps of simulated time
+                for _ in range(self.sim_clock.pending_steps(self.frame_time)):
+                    self.sim_clock.advance()
+                    self.player_game.update()
+                    self.ai_game.update()
+                    self.ai_move()
+
+                # draw games and UI 
+                player_rects = [self.player_game.draw(full_redraw)]
+                ai_rects = [self.ai_game.draw(full_redraw)]
+                player_rects += [self.player_score.run(full_redraw), self.player_preview.run(full_redraw)]
+                ai_rects += [self.ai_score.run(full_redraw), self.ai_preview.run(full_redraw)]
+                player_rects = [rect for rect in player_rects if rect]
+                ai_rects = [rect for rect in ai_rects if rect]
+
+                # overlay if one player loses, repainted with its half when that half changes
                 if self.player_game.game_over and not self.ai_game.game_over:
                     if self.player_lost_time is None:
-                        self.player_lost_time = pygame.time.get_ticks()
+                        self.player_lost_time = self.sim_clock.get_ticks()
 
                     # reduce ai delay over time 
-                    elapsed = pygame.time.get_ticks() - self.player_lost_time
+                    elapsed = self.sim_clock.get_ticks() - self.player_lost_time
                     speedup = min(elapsed / 10000, 1)  
                     self.ai_move_delay = int(500 - speedup * 450)
                     self.ai_move_delay = max(self.ai_move_delay, self.min_ai_delay)
 
-                    self.display_surface.blit(overlay, (0, 0))
-                    line1 = font.render("You lost.", True, "white")
-                    line2 = font.render("Waiting for AI...", True, "white")
-
-                    line1_rect = line1.get_rect(center=(WINDOW_WIDTH // 4, WINDOW_HEIGHT // 2))
-                    line2_rect = line2.get_rect(center=(WINDOW_WIDTH // 4, WINDOW_HEIGHT // 2 + 30))
-
-                    self.display_surface.blit(line1, line1_rect)
-                    self.display_surface.blit(line2, line2_rect)
-
+                    if self.drawn_overlay != 'player' or player_rects:
+                        player_rects = self.draw_overlay('player', "You lost.", "Waiting for AI...")
 
                 elif self.ai_game.game_over and not self.player_game.game_over:
-                    self.display_surface.blit(overlay, (WINDOW_WIDTH // 2, 0))
-                    line1 = font.render("AI lost.", True, "white")
-                    line2 = font.render("You can still play!", True, "white")
-                    
-                    line1_rect = line1.get_rect(center=(3 * WINDOW_WIDTH // 4, WINDOW_HEIGHT // 2))
-                    line2_rect = line2.get_rect(center=(3 * WINDOW_WIDTH // 4, WINDOW_HEIGHT // 2 + 30))
+                    if self.drawn_overlay != 'ai' or ai_rects:
+                        ai_rects = self.draw_overlay('ai', "AI lost.", "You can still play!")
 
-                    self.display_surface.blit(line1, line1_rect)
-                    self.display_surface.blit(line2, line2_rect)
+                if not full_redraw:
+                    dirty_rects = player_rects + ai_rects
 
                 # game ends
                 if self.player_game.game_over and self.ai_game.game_over:
@@ -342,8 +311,75 @@ class Main:
                     for button in self.buttons:
                         button.handle_event(event)
     
-            pygame.display.update()
-            self.clock.tick()
+            if dirty_rects is None:
+                pygame.display.update()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+
+            # cap the frame rate, the elapsed time feeds the next simulation steps
+            self.frame_time = self.clock.tick(FPS)
+
+    def ai_move(self):
+        # ai choose move
+        current_time = self.sim_clock.get_ticks()
+        if not self.ai_game.game_over and current_time - self.last_ai_move_time > self.ai_move_delay:
+            piece_type = self.ai_game.tetromino.shape
+            board = [[1 if cell else 0 for cell in row] for row in self.ai_game.field_data]
+            valid_actions = get_valid_actions(piece_type, board)
+            if AI_LOOKAHEAD:
+                next_shapes = self.ai_next_shapes[:AI_LOOKAHEAD]
+                action = plan_action(piece_type, board, next_shapes, dqn_evaluator(self.agent), time_budget=AI_PLAN_BUDGET, table=self.ai_table)
+            else:
+                action = pick_numpy_action(self.agent, piece_type, board, self.ai_table, self.ai_value_table)
+
+            # difficulty tweaking
+            if self.difficulty == 'easy' and self.ai_game.current_level > 5:
+                chance = self.ai_game.current_level / 15
+                if random.random() < chance and valid_actions:
+                    action = random.choice(valid_actions)
+
+            elif self.difficulty == 'medium' and self.ai_game.current_level > 15:
+                chance = self.ai_game.current_level / 100
+                if random.random() < chance and valid_actions:
+                    action = random.choice(valid_actions)
+
+            # apply ai move
+            if action:
+                rot_idx, x_pos = action
+                self.ai_game.apply_action(piece_type, rot_idx, x_pos)
+                self.stats['total_ai_moves'] += 1
+                self.last_ai_move_time = current_time
+
+    def draw_overlay(self, side, text1, text2):
+        # repaint one half of the play screen and darken it
+        if side == 'player':
+            components = (self.player_game, self.player_score, self.player_preview)
+            half = pygame.Rect(0, 0, WINDOW_WIDTH // 2, WINDOW_HEIGHT)
+            center_x = WINDOW_WIDTH // 4
+        else:
+            components = (self.ai_game, self.ai_score, self.ai_preview)
+            half = pygame.Rect(WINDOW_WIDTH // 2, 0, WINDOW_WIDTH // 2, WINDOW_HEIGHT)
+            center_x = 3 * WINDOW_WIDTH // 4
+
+        self.display_surface.fill(GRAY, half)
+        game, score, preview = components
+        game.draw()
+        score.run()
+        preview.run()
+        self.display_surface.blit(self.overlay, half)
+
+        font = get_font(None, 36)
+        line1 = render_text(font, text1, "white")
+        line2 = render_text(font, text2, "white")
+
+        line1_rect = line1.get_rect(center=(center_x, WINDOW_HEIGHT // 2))
+        line2_rect = line2.get_rect(center=(center_x, WINDOW_HEIGHT // 2 + 30))
+
+        self.display_surface.blit(line1, line1_rect)
+        self.display_surface.blit(line2, line2_rect)
+
+        self.drawn_overlay = side
+        return [half]
 
     def load_stats(self):
         if os.path.isfile('stats.json'):
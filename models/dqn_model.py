@@ -1,5 +1,7 @@
+import numpy as np
 import torch
 import torch.nn as nn
+from ai_controller import unique_rows, pick_value_action
 
 # deep q-network with 2 hidden layers
 class DQN(nn.Module):
@@ -16,6 +18,16 @@ class DQN(nn.Module):
     def forward(self, state):
         return self.model(state)
 
+def dqn_values(model, features):
+    # q-value of every feature row in a single batched forward pass
+    rows, index = unique_rows(features)
+    with torch.inference_mode():
+        return model(torch.tensor(rows, dtype=torch.float32)).squeeze(1)[index]
+
+def pick_dqn_action(model, piece_type, board, table=None, value_table=None):
+    # scores every valid drop at once, see ai_controller.pick_value_action
+    return pick_value_action(model, dqn_values, piece_type, board, table, value_table)
+
 def load_agent(model_path=None):
     model = DQN()
     model.load_state_dict(torch.load(model_path))
@@ -32,4 +44,15 @@ def set_agent_model(difficulty):
 
     return load_agent(model_path)
 
+def export_numpy(model, path):
+    # the weights as a .npz for models.numpy_dqn, which the game loads without torch
+    np.savez(path, **{name: tensor.detach().cpu().numpy() for name, tensor in model.state_dict().items()})
+
+# python -m models.dqn_model exports the shipped models
+if __name__ == "__main__":
+    for difficulty in ('easy', 'medium', 'hard'):
+        model_path = f"models/{difficulty}/dqn_{difficulty}.pt"
+        export_numpy(load_agent(model_path), model_path[:-3] + '.npz')
+        print(f"exported {model_path}")
+
 
@@ -0,0 +1,48 @@
+import numpy as np
+from ai_controller import unique_rows, pick_value_action
+
+# inference-only DQN for the live game: the trained weights as NumPy arrays,
+# evaluated with plain matrix multiplies, so playing never imports torch.
+# the .npz files next to the .pt ones come from python -m models.dqn_model
+
+class NumpyDQN:
+    def __init__(self, layers):
+        # [(weight, bias)] per linear layer, weight stored as (in, out) for x @ weight
+        self.layers = layers
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        # arrays: DQN state dict names to arrays, like model.0.weight and model.0.bias
+        indices = sorted(int(name.split('.')[1]) for name in arrays if name.endswith('.weight'))
+        layers = []
+        for i in indices:
+            weight = np.asarray(arrays[f'model.{i}.weight'], dtype=np.float32)
+            bias = np.asarray(arrays[f'model.{i}.bias'], dtype=np.float32)
+            layers.append((np.ascontiguousarray(weight.T), bias))
+        return cls(layers)
+
+    def __call__(self, features):
+        # (n, 1) values for n feature rows, relu between the layers like DQN
+        x = np.asarray(features, dtype=np.float32)
+        last = len(self.layers) - 1
+        for i, (weight, bias) in enumerate(self.layers):
+            x = x @ weight + bias
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+def numpy_values(model, features):
+    # q-value of every feature row in a single batched pass
+    rows, index = unique_rows(features)
+    return model(rows)[:, 0][index]
+
+def pick_numpy_action(model, piece_type, board, table=None, value_table=None):
+    # scores every valid drop at once, see ai_controller.pick_value_action
+    return pick_value_action(model, numpy_values, piece_type, board, table, value_table)
+
+def load_numpy_agent(model_path):
+    with np.load(model_path) as arrays:
+        return NumpyDQN.from_arrays(dict(arrays))
+
+def set_agent_model(difficulty):
+    return load_numpy_agent(f"models/{difficulty}/dqn_{difficulty}.npz")
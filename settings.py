@@ -1,8 +1,7 @@
 import pygame 
+from game.rules import *
 
 # game size 
-COLUMNS = 10
-ROWS = 20
 CELL_SIZE = 40
 GAME_WIDTH, GAME_HEIGHT = COLUMNS * CELL_SIZE, ROWS * CELL_SIZE
 
@@ -16,89 +15,21 @@ PADDING = 20
 WINDOW_WIDTH = (SIDEBAR_WIDTH + GAME_WIDTH) * 2 + PADDING * 6  # 2 games + 2 sidebars + gaps
 WINDOW_HEIGHT = GAME_HEIGHT + PADDING * 2
 
+# rendering, False repaints the whole window every frame
+DIRTY_RECT_RENDERING = True
+
+# frame rate cap, the game logic runs in fixed SIM_STEP ms ticks independent of it
+FPS = 60
+SIM_STEP = 5
+MAX_SIM_STEPS = 50  # most ticks caught up in one frame after a stall
+
+# ai lookahead: preview pieces searched by ai_planner, 0 = current piece only
+AI_LOOKAHEAD = 2
+AI_PLAN_BUDGET = 0.008  # seconds per move, stays inside one frame
+
 # game behaviour 
 UPDATE_START_SPEED = 800
 MOVE_WAIT_TIME = 150
 ROTATE_WAIT_TIME = 100
 BLOCK_OFFSET = pygame.Vector2(COLUMNS // 2, -1)
 LOCK_DELAY = 200
-
-# colors 
-YELLOW = '#f1e60d'
-RED = '#e51b20'
-BLUE = '#204b9b'
-GREEN = '#65b32e'
-PURPLE = '#7b217f'
-CYAN = '#6cc6d9'
-ORANGE = '#f07e13'
-GRAY = '#1C1C1C'
-LINE_COLOR = '#FFFFFF'
-
-# shapes
-TETROMINOS = {
-	'T': {
-        'shape': [(0,0), (-1,0), (1,0), (0,-1)],
-        'rotations': [
-            [(0, 0), (-1, 0), (1, 0), (0, -1)],
-			[(0, 0), (0, 1), (0, -1), (-1, 0)],
-			[(0, 0), (1, 0), (-1, 0), (0, 1)],
-			[(0, 0), (0, -1), (0, 1), (1, 0)]
-        ],  
-        'color': PURPLE},
-	'O': {
-        'shape': [(0,0), (0,-1), (1,0), (1,-1)],
-        'rotations': [
-            [(0,0), (0,-1), (1,0), (1,-1)],
-			[(0,0), (0,-1), (1,0), (1,-1)],
-			[(0,0), (0,-1), (1,0), (1,-1)],
-			[(0,0), (0,-1), (1,0), (1,-1)]
-        ],   
-        'color': YELLOW},
-	'J': {
-        'shape': [(0,0), (0,-1), (0,1), (-1,1)],
-        'rotations': [
-            [(0, 0), (0, -1), (0, 1), (-1, 1)],
-			[(0, 0), (-1, 0), (1, 0), (1, 1)],
-			[(0, 0), (0, 1), (0, -1), (1, -1)],
-			[(0, 0), (1, 0), (-1, 0), (-1, -1)]
-        ],  
-        'color': BLUE},
-	'L': {
-        'shape': [(0,0), (0,-1), (0,1), (1,1)], 
-		'rotations': [
-            [(0, 0), (0, -1), (0, 1), (1, 1)],
-			[(0, 0), (-1, 0), (1, 0), (1, -1)],
-			[(0, 0), (0, 1), (0, -1), (-1, -1)],
-			[(0, 0), (1, 0), (-1, 0), (-1, 1)]
-        ], 
-        'color': ORANGE},
-	'I': {
-        'shape': [(0,0), (0,-1), (0,-2), (0,1)],
-        'rotations': [
-            [(0, 0), (0, -1), (0, -2), (0, 1)],
-			[(0, 0), (-1, 0), (-2, 0), (1, 0)],
-			[(0, 0), (0, 1), (0, 2), (0, -1)],
-			[(0, 0), (1, 0), (2, 0), (-1, 0)]
-        ],  
-        'color': CYAN},
-	'S': {
-        'shape': [(0,0), (-1,0), (0,-1), (1,-1)],
-        'rotations': [
-            [(0, 0), (-1, 0), (0, -1), (1, -1)],
-			[(0, 0), (0, 1), (-1, 0), (-1, -1)],
-			[(0, 0), (1, 0), (0, 1), (-1, 1)],
-			[(0, 0), (0, -1), (1, 0), (1, 1)]
-        ],   
-        'color': GREEN},
-	'Z': {
-        'shape': [(0,0), (1,0), (0,-1), (-1,-1)],
-        'rotations': [
-            [(0, 0), (1, 0), (0, -1), (-1, -1)],
-			[(0, 0), (0, -1), (-1, 0), (-1, 1)],
-			[(0, 0), (-1, 0), (0, 1), (1, 1)],
-			[(0, 0), (0, 1), (1, 0), (1, -1)]
-        ],    
-        'color': RED}
-}
-
-SCORE_DATA = {1: 40, 2: 100, 3: 300, 4: 1200}
\ No newline at end of file
@@ -0,0 +1,23 @@
+import torch
+import pytest
+from dqn.actor_learner import pack, unpack, train_distributed
+from dqn.train_dqn import load_models
+
+def test_pack_round_trip():
+    state, next_state = torch.rand(8), torch.rand(8)
+    chunk = torch.stack([pack(state, 2.5, next_state, True), pack(next_state, -1.0, state, False)])
+    states, rewards, next_states, dones = unpack(chunk)
+    assert torch.equal(states[0], state) and torch.equal(next_states[0], next_state)
+    assert rewards.tolist() == [2.5, -1.0] and dones.tolist() == [1.0, 0.0]
+
+def test_learner_trains_on_actor_transitions():
+    start, _ = load_models()
+    model = train_distributed(num_actors=1, sync_interval=5, train_steps=20, envs_per_actor=2, save_path=None, seed=0)
+    changed = [not torch.equal(a, b) for a, b in zip(start.state_dict().values(), model.state_dict().values())]
+    assert all(changed)
+
+def test_actor_crash_stops_the_learner():
+    # actors without games fail on their first move
+    with pytest.raises(RuntimeError, match='actor 0 exited') as error:
+        train_distributed(num_actors=1, train_steps=20, envs_per_actor=0, save_path=None, seed=0)
+    assert 'Traceback' in str(error.value)
@@ -0,0 +1,23 @@
+from benchmarks.corpus import build_corpus
+from benchmarks.suite import BENCHMARKS, run_suite, compare
+
+def test_corpus_is_repeatable():
+    first = build_corpus(games=2, boards_per_game=20)
+    second = build_corpus(games=2, boards_per_game=20)
+    assert [(board.rows, piece) for board, piece in first.positions] == [(board.rows, piece) for board, piece in second.positions]
+    assert first.afterstates == second.afterstates
+
+def test_suite_and_compare():
+    corpus = build_corpus(games=1, boards_per_game=10)
+    results = run_suite(corpus, ['get_valid_actions', 'evaluate_board'], repeats=1, min_time=0.05)
+    assert set(results['benchmarks']) == {'get_valid_actions', 'evaluate_board'}
+    # short corpus passes are repeated up to the minimum time
+    for result in results['benchmarks'].values():
+        assert result['seconds'] >= 0.05 and result['ops'] > len(corpus.positions)
+    assert all(name in BENCHMARKS for name in results['benchmarks'])
+
+    # a baseline twice as fast flags both, a slower one flags none
+    faster = {'benchmarks': {name: {'ops_per_sec': r['ops_per_sec'] * 2} for name, r in results['benchmarks'].items()}}
+    slower = {'benchmarks': {name: {'ops_per_sec': r['ops_per_sec'] / 2} for name, r in results['benchmarks'].items()}}
+    assert all(row[4] for row in compare(results, faster))
+    assert not any(row[4] for row in compare(results, slower))
@@ -0,0 +1,62 @@
+import random
+from game.rules import *
+from game.bitboard import Bitboard, FULL_ROW
+from ai_controller import get_lowest_valid_y, get_valid_actions
+
+def random_board(rng, fill=0.3):
+    board = [[0 for _ in range(COLUMNS)] for _ in range(ROWS)]
+    for y in range(ROWS // 2, ROWS):
+        for x in range(COLUMNS):
+            if rng.random() < fill:
+                board[y][x] = 1
+    return board
+
+def test_roundtrip():
+    rng = random.Random(1)
+    board = random_board(rng)
+    assert Bitboard.from_field(board).to_field() == board
+
+def test_drop_matches_nested_list():
+    rng = random.Random(2)
+    for _ in range(20):
+        board = random_board(rng, rng.random())
+        bitboard = Bitboard.from_field(board)
+        for piece_type, data in TETROMINOS.items():
+            assert get_valid_actions(piece_type, bitboard) == get_valid_actions(piece_type, board)
+            for rotation in data['rotations']:
+                for x in range(-3, COLUMNS + 3):
+                    assert get_lowest_valid_y(rotation, x, bitboard) == get_lowest_valid_y(rotation, x, board)
+
+def test_lock_and_clear():
+    bitboard = Bitboard([0] * (ROWS - 2) + [0b100, FULL_ROW & ~0b11])
+    assert bitboard.heights[:4] == [0, 0, 2, 1]
+    rotation = TETROMINOS['O']['rotations'][0]
+
+    y = bitboard.lowest_valid_y(rotation, 0)
+    assert y == ROWS - 1
+    assert bitboard.collides(rotation, 0, ROWS)
+    bitboard.lock(rotation, 0, y)
+    assert bitboard.full_rows() == [ROWS - 1]
+
+    assert bitboard.clear_full_rows() == 1
+    assert bitboard.rows[ROWS - 1] == 0b111
+    assert bitboard.rows[:ROWS - 1] == [0] * (ROWS - 1)
+    assert bitboard.heights == [1, 1, 1] + [0] * (COLUMNS - 3)
+
+def test_profile_stays_in_sync():
+    rng = random.Random(4)
+    for _ in range(20):
+        bitboard = Bitboard.from_field(random_board(rng, rng.random()))
+        for _ in range(30):
+            piece_type = rng.choice(list(TETROMINOS.keys()))
+            actions = get_valid_actions(piece_type, bitboard)
+            if not actions:
+                break
+            rotation_index, x_pos = rng.choice(actions)
+            rotation = TETROMINOS[piece_type]['rotations'][rotation_index]
+            bitboard.lock(rotation, x_pos, bitboard.lowest_valid_y(rotation, x_pos))
+            bitboard.clear_full_rows()
+
+            rescanned = Bitboard(bitboard.rows)
+            assert bitboard.heights == rescanned.heights
+            assert bitboard.holes == rescanned.holes
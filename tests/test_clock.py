@@ -0,0 +1,20 @@
+from game.clock import SimClock
+from game.timer import Timer
+
+def test_pending_steps_carry_remainder():
+    clock = SimClock(5, max_steps=10)
+    assert clock.pending_steps(12) == 2
+    assert clock.pending_steps(3) == 1
+    assert clock.pending_steps(4) == 0
+    # long stall is capped
+    assert clock.pending_steps(1000) == 10
+
+def test_timer_runs_on_sim_time():
+    clock = SimClock(5)
+    calls = []
+    timer = Timer(20, True, lambda: calls.append(clock.get_ticks()), clock)
+    timer.activate()
+    for _ in range(20):
+        clock.advance()
+        timer.update()
+    assert calls == [20, 40, 60, 80, 100]
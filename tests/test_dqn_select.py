@@ -0,0 +1,21 @@
+import torch
+from game.rules import *
+from game.placements import generate_moves
+from ai_controller import extract_features, place_piece
+from models.dqn_model import load_agent, pick_dqn_action
+from tests.test_features import random_boards
+
+def test_batched_selection_matches_loop():
+    model = load_agent('models/easy/dqn_easy.pt')
+    for board in random_boards(11, 10):
+        for piece_type, data in TETROMINOS.items():
+            best_q = float('-inf')
+            best_action = None
+            for rot_idx, x_pos, y in generate_moves(piece_type, board):
+                temp_board = place_piece(board, data['rotations'][rot_idx], x_pos, y)
+                with torch.no_grad():
+                    q = model(extract_features(temp_board).unsqueeze(0)).item()
+                if q > best_q:
+                    best_q = q
+                    best_action = (rot_idx, x_pos)
+            assert pick_dqn_action(model, piece_type, board) == best_action
@@ -0,0 +1,111 @@
+import random
+import numpy as np
+from game.rules import *
+from game.bitboard import Bitboard
+from game.placements import generate_moves
+from ai_controller import evaluate_board, extract_features, pick_best_action, place_piece
+from board_features import FeatureCache, board_features, weighted_score, stack_boards, extract_features_batch, evaluate_boards
+from tests.test_bitboard import random_board
+
+WEIGHTS = [-4.93, 5.89, -2.68, -8.76, -1.89, 0.68, -10.67, -11.09]
+
+def reference_features(board):
+    # the original per-cell loops from evaluate_board
+    holes = 0
+    heights = [0 for _ in range(COLUMNS)]
+    for x in range(COLUMNS):
+        block_found = False
+        for y in range(ROWS):
+            if board[y][x] != 0:
+                if not block_found:
+                    heights[x] = ROWS - y
+                    block_found = True
+            elif block_found:
+                holes += 1
+
+    bumpiness = sum(abs(heights[x] - heights[x + 1]) for x in range(COLUMNS - 1))
+    lines_cleared = sum(1 for row in board if all(cell != 0 for cell in row))
+
+    wells = 0
+    for x in range(1, COLUMNS - 1):
+        if heights[x] < heights[x - 1] and heights[x] < heights[x + 1]:
+            wells += (heights[x - 1] - heights[x]) + (heights[x + 1] - heights[x])
+
+    row_transitions = 0
+    for row in board:
+        prev = 1
+        for cell in row:
+            if cell != prev:
+                row_transitions += 1
+            prev = cell
+        if prev == 0:
+            row_transitions += 1
+
+    col_transitions = 0
+    for x in range(COLUMNS):
+        prev = 1
+        for y in range(ROWS):
+            if board[y][x] != prev:
+                col_transitions += 1
+            prev = board[y][x]
+
+    return [holes, lines_cleared, bumpiness, sum(heights), max(heights), wells, row_transitions, col_transitions]
+
+def random_boards(seed, count=50):
+    rng = random.Random(seed)
+    boards = [random_board(rng, rng.random()) for _ in range(count)]
+    # a few full rows for the lines cleared feature
+    for board in boards[:10]:
+        board[ROWS - 1] = [1] * COLUMNS
+    return boards
+
+def test_batch_matches_evaluate_board():
+    boards = random_boards(5)
+    features = extract_features_batch(np.array(boards))
+    assert features.shape == (len(boards), 8)
+
+    for board, row in zip(boards, features):
+        assert list(row) == reference_features(board)
+
+def test_fused_matches_reference():
+    for board in random_boards(9):
+        expected = reference_features(board)
+        assert board_features(board) == expected
+        assert board_features(Bitboard.from_field(board)) == expected
+        assert evaluate_board(board, WEIGHTS) == weighted_score(expected, WEIGHTS)
+
+        # extract_features leaves lines cleared at 0
+        expected[1] = 0
+        assert extract_features(board).tolist() == expected
+
+def test_stack_bitboards():
+    boards = random_boards(6)
+    bitboards = [Bitboard.from_field(board) for board in boards]
+    assert (stack_boards(bitboards) == np.array(boards)).all()
+
+def test_scores_match_evaluate_board():
+    boards = random_boards(7)
+    scores = evaluate_boards(stack_boards(boards), WEIGHTS)
+    assert list(scores) == [evaluate_board(board, WEIGHTS) for board in boards]
+
+def test_pick_best_action_unchanged():
+    for board in random_boards(8, 20):
+        for piece_type, data in TETROMINOS.items():
+            best_score = float('-inf')
+            best_action = None
+            for rotation_index, x_pos, y in generate_moves(piece_type, board):
+                temp_board = place_piece(board, data['rotations'][rotation_index], x_pos, y)
+                score = evaluate_board(temp_board, WEIGHTS)
+                if score > best_score:
+                    best_score = score
+                    best_action = (rotation_index, x_pos)
+            assert pick_best_action(piece_type, board, WEIGHTS) == best_action
+
+def test_child_features_match_full_recompute():
+    for board in random_boards(10, 30):
+        cache = FeatureCache(board)
+        for piece_type, data in TETROMINOS.items():
+            for rotation_index, x_pos, y in generate_moves(piece_type, board):
+                rotation = data['rotations'][rotation_index]
+                temp_board = place_piece(board, rotation, x_pos, y)
+                assert cache.child_features(rotation, x_pos, y) == reference_features(temp_board)
@@ -0,0 +1,33 @@
+import random
+from multiprocessing import Pool
+from ga.ga import generate_individual, evaluate_population
+from game.headless import HeadlessMain
+
+def test_parallel_matches_serial():
+    random.seed(0)
+    population = [generate_individual() for _ in range(3)]
+    population.append(population[0])
+    seeds = [10, 11]
+
+    serial = evaluate_population(population, seeds, workers=1)
+    assert evaluate_population(population, seeds, workers=2) == serial
+    assert evaluate_population(population, seeds, workers=1) == serial
+
+    # same weights on the same seeds give the same fitness
+    assert serial[0] == serial[3]
+
+    # one pool for several generations, the worker tables carry over
+    with Pool(2) as pool:
+        assert evaluate_population(population, seeds, pool=pool) == serial
+        assert evaluate_population(population, seeds, pool=pool) == serial
+
+def test_seeded_piece_sequence():
+    main = HeadlessMain()
+    sequences = []
+    for seed in (5, 5, 6):
+        main.reset_game(seed)
+        shapes = [main.ai_game.tetromino.shape] + [main.get_ai_next_shape() for _ in range(20)]
+        sequences.append(shapes)
+
+    assert sequences[0] == sequences[1]
+    assert sequences[0] != sequences[2]
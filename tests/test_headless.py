@@ -0,0 +1,88 @@
+import os
+import random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from settings import *
+from game.game import Game
+from game.headless import HeadlessGame, HeadlessMain
+from ai_controller import pick_best_action
+
+WEIGHTS = [-4.93, 5.89, -2.68, -8.76, -1.89, 0.68, -10.67, -11.09]
+
+def play(game_class, seed, steps=200):
+    rng = random.Random(seed)
+    shapes = [rng.choice(list(TETROMINOS.keys())) for _ in range(steps + 1)]
+    queue = iter(shapes)
+
+    random.seed(seed)
+    if game_class is Game:
+        game = Game(None, lambda: next(queue), lambda *args: None)
+    else:
+        game = HeadlessGame(lambda: next(queue))
+
+    for _ in range(steps):
+        piece_type = game.tetromino.shape
+        board = [[1 if cell else 0 for cell in row] for row in game.field_data]
+        action = pick_best_action(piece_type, board, WEIGHTS)
+        if action:
+            game.apply_action(piece_type, *action)
+
+    board = [[1 if cell else 0 for cell in row] for row in game.field_data]
+    return board, game.current_score, game.current_lines, game.current_level
+
+def test_headless_matches_game():
+    pygame.init()
+    for seed in range(3):
+        assert play(HeadlessGame, seed) == play(Game, seed)
+
+def test_headless_main_tracks_score():
+    main = HeadlessMain()
+    for _ in range(100):
+        piece_type = main.ai_game.tetromino.shape
+        board = [[1 if cell else 0 for cell in row] for row in main.ai_game.field_data]
+        action = pick_best_action(piece_type, board, WEIGHTS)
+        if action:
+            main.ai_game.apply_action(piece_type, *action)
+
+    assert main.ai_score.lines == main.ai_game.current_lines
+    assert main.ai_score.score == main.ai_game.current_score
+    assert len(main.ai_next_shapes) == 3
+
+def test_game_compacts_cleared_rows():
+    pygame.init()
+    game = Game(None, lambda: 'I', lambda *args: None)
+    field = game.field_data
+    for y in range(ROWS - 4, ROWS):
+        field[y] = ['red'] * COLUMNS
+    field[ROWS - 3][0] = 0
+    field[ROWS - 5][1] = 'blue'
+
+    game.check_finished_rows([ROWS - 4, ROWS - 3, ROWS - 2])
+    assert game.field_data is field
+    assert field[ROWS - 1] == ['red'] * COLUMNS
+    assert field[ROWS - 2] == [0] + ['red'] * (COLUMNS - 1)
+    assert field[ROWS - 3][1] == 'blue'
+    assert all(not any(row) for row in field[:ROWS - 3])
+    assert game.current_lines == 2
+
+def test_ghost_matches_row_by_row_drop():
+    from game.game import Tetromino
+    from tests.test_bitboard import random_board
+    pygame.init()
+    rng = random.Random(4)
+    for _ in range(200):
+        field = random_board(rng, rng.random())
+        piece = Tetromino(rng.choice(list(TETROMINOS.keys())), pygame.sprite.Group(), None, field)
+        shift = pygame.Vector2(rng.randint(-3, 3), rng.randint(0, ROWS - 3))
+        for block in piece.blocks:
+            block.pos += shift
+        if any(not 0 <= block.pos.x < COLUMNS or block.pos.y >= ROWS for block in piece.blocks):
+            continue
+        if any(block.pos.y >= 0 and field[int(block.pos.y)][int(block.pos.x)] for block in piece.blocks):
+            continue
+
+        # move down one row at a time
+        drop = 0
+        while all(block.pos.y + drop + 1 < ROWS and not (block.pos.y + drop + 1 >= 0 and field[int(block.pos.y + drop + 1)][int(block.pos.x)]) for block in piece.blocks):
+            drop += 1
+        assert piece.get_ghost_position() == [block.pos + (0, drop) for block in piece.blocks]
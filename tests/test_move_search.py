@@ -0,0 +1,92 @@
+import random
+from game.rules import *
+from game.bitboard import Bitboard
+from game.placements import generate_moves
+from game.move_search import reachable_moves, hold_moves
+from game.headless import HeadlessMain
+from ai_controller import pick_best_action, pick_hold_action
+from tests.test_features import WEIGHTS
+
+def cell_sets(piece_type, moves):
+    rotations = TETROMINOS[piece_type]['rotations']
+    return [frozenset((x + dx, y + dy) for dx, dy in rotations[r]) for r, x, y in moves]
+
+def test_matches_hard_drops_without_overhangs():
+    rng = random.Random(17)
+    for _ in range(50):
+        heights = [rng.randint(0, 10) for _ in range(COLUMNS)]
+        board = [[1 if ROWS - y <= heights[x] else 0 for x in range(COLUMNS)] for y in range(ROWS)]
+        for piece_type in TETROMINOS:
+            reachable = cell_sets(piece_type, reachable_moves(piece_type, board))
+            assert len(set(reachable)) == len(reachable)
+            assert set(reachable) == set(cell_sets(piece_type, generate_moves(piece_type, board)))
+
+def test_ledges_and_tucks():
+    # overhang over columns 0-2, open underneath
+    board = Bitboard.from_field([[1 if y == 17 and x < 3 else 0 for x in range(COLUMNS)] for y in range(ROWS)])
+    moves = reachable_moves('T', board)
+    assert (0, 1, 16) in moves  # resting on the ledge
+    assert (0, 1, 19) in moves  # slid in underneath
+    assert (0, 1, 16) not in generate_moves('T', board)
+
+def test_hold_moves():
+    board = Bitboard()
+    moves = hold_moves('T', None, 'I', board)
+    assert [move[1:] for move in moves if not move[0]] == reachable_moves('T', board)
+    assert [move[1:] for move in moves if move[0]] == reachable_moves('I', board)
+    assert all(not move[0] for move in hold_moves('T', 'T', 'I', board))
+
+def test_headless_plays_reachable_moves():
+    main = HeadlessMain()
+    main.reset_game(3)
+    first = main.ai_game.tetromino.shape
+    upcoming = main.ai_next_shapes[0]
+    main.ai_game.hold()
+    assert (main.ai_game.hold_shape, main.ai_game.tetromino.shape) == (first, upcoming)
+
+    for _ in range(100):
+        piece_type = main.ai_game.tetromino.shape
+        action = pick_best_action(piece_type, main.ai_game.board, WEIGHTS, reachable=True)
+        assert action in reachable_moves(piece_type, main.ai_game.board)
+        main.ai_game.apply_action(piece_type, *action)
+    assert main.ai_score.lines > 0
+
+def test_hold_once_per_piece():
+    main = HeadlessMain()
+    main.reset_game(4)
+    game = main.ai_game
+    first = game.tetromino.shape
+    assert game.hold()
+    second = game.tetromino.shape
+    assert not game.hold()
+    assert (game.hold_shape, game.tetromino.shape) == (first, second)
+
+    # locking the piece allows the next swap
+    action = pick_best_action(second, game.board, WEIGHTS)
+    game.apply_action(second, *action)
+    assert game.hold()
+    assert game.tetromino.shape == first
+
+def test_pick_hold_action():
+    rng = random.Random(8)
+    for _ in range(20):
+        heights = [rng.randint(0, 8) for _ in range(COLUMNS)]
+        board = Bitboard.from_field([[1 if ROWS - y <= heights[x] else 0 for x in range(COLUMNS)] for y in range(ROWS)])
+        action = pick_hold_action('S', None, 'I', board, WEIGHTS)
+        assert action in hold_moves('S', None, 'I', board)
+        piece = 'I' if action[0] else 'S'
+        # the best reachable move of whichever piece it plays
+        assert action[1:] == pick_best_action(piece, board, WEIGHTS, reachable=True)
+
+def test_ga_plays_with_hold():
+    from ga.ga import evaluate_individual, evaluate_population
+    main = HeadlessMain()
+    fitness = evaluate_individual(main, WEIGHTS, seed=2, hold=True)
+    assert main.ai_game.hold_shape is not None
+    assert fitness > 0
+
+    # the options reach pool workers as arguments
+    for hold in (True, False):
+        serial = evaluate_population([WEIGHTS], [1], workers=1, hold=hold)
+        assert evaluate_population([WEIGHTS], [1], workers=2, hold=hold) == serial
+    assert serial != evaluate_population([WEIGHTS], [1], workers=1, hold=True)
@@ -0,0 +1,35 @@
+import torch
+import numpy as np
+from game.rules import *
+from ai_planner import plan_action, dqn_evaluator
+from models.dqn_model import load_agent, pick_dqn_action
+from models.numpy_dqn import load_numpy_agent, pick_numpy_action
+from tests.test_features import random_boards
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+def test_exported_models_match_torch():
+    # the shipped .npz files are up to date with the .pt files
+    rng = np.random.default_rng(0)
+    features = rng.uniform(0, 60, size=(500, 8)).astype(np.float32)
+    for difficulty in DIFFICULTIES:
+        model = load_agent(f'models/{difficulty}/dqn_{difficulty}.pt')
+        numpy_model = load_numpy_agent(f'models/{difficulty}/dqn_{difficulty}.npz')
+        with torch.inference_mode():
+            expected = model(torch.from_numpy(features)).numpy()
+        assert np.allclose(numpy_model(features), expected, rtol=1e-5, atol=1e-4)
+
+def test_numpy_picks_match_torch_picks():
+    for difficulty in DIFFICULTIES:
+        model = load_agent(f'models/{difficulty}/dqn_{difficulty}.pt')
+        numpy_model = load_numpy_agent(f'models/{difficulty}/dqn_{difficulty}.npz')
+        for board in random_boards(21, 10):
+            for piece_type in TETROMINOS:
+                assert pick_numpy_action(numpy_model, piece_type, board) == pick_dqn_action(model, piece_type, board)
+
+def test_planner_accepts_numpy_model():
+    model = load_agent('models/easy/dqn_easy.pt')
+    numpy_model = load_numpy_agent('models/easy/dqn_easy.npz')
+    for board in random_boards(22, 5):
+        expected = plan_action('T', board, ['I', 'O'], dqn_evaluator(model), time_budget=10)
+        assert plan_action('T', board, ['I', 'O'], dqn_evaluator(numpy_model), time_budget=10) == expected
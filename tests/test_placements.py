@@ -0,0 +1,39 @@
+import random
+from game.rules import *
+from game.placements import PLACEMENTS, generate_moves
+from ai_controller import get_lowest_valid_y, place_piece
+from tests.test_bitboard import random_board
+
+def test_duplicate_rotations_collapsed():
+    counts = {piece_type: len(placements) for piece_type, placements in PLACEMENTS.items()}
+    assert counts == {'T': 4, 'O': 1, 'J': 4, 'L': 4, 'I': 2, 'S': 2, 'Z': 2}
+
+def test_moves_cover_every_rotation():
+    rng = random.Random(3)
+    for _ in range(20):
+        board = random_board(rng, rng.random())
+        for piece_type, data in TETROMINOS.items():
+            # landing spots from the table, as cell sets
+            moves = generate_moves(piece_type, board)
+            found = set()
+            for rotation_index, x_pos, y in moves:
+                rotation = data['rotations'][rotation_index]
+                assert get_lowest_valid_y(rotation, x_pos, board) == y
+                found.add(frozenset((x_pos + dx, y + dy) for dx, dy in rotation))
+            assert len(found) == len(moves)
+
+            # landing spots from every raw rotation
+            expected = set()
+            for rotation in data['rotations']:
+                for x_pos in range(-2, COLUMNS + 2):
+                    y = get_lowest_valid_y(rotation, x_pos, board)
+                    if y is not None:
+                        expected.add(frozenset((x_pos + dx, y + dy) for dx, dy in rotation))
+            assert found == expected
+
+def test_place_piece():
+    board = [[0 for _ in range(COLUMNS)] for _ in range(ROWS)]
+    rotation_index, x_pos, y = generate_moves('I', board)[0]
+    temp_board = place_piece(board, TETROMINOS['I']['rotations'][rotation_index], x_pos, y)
+    assert sum(map(sum, temp_board)) == 4
+    assert sum(map(sum, board)) == 0
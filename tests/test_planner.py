@@ -0,0 +1,54 @@
+from game.rules import *
+from game.headless import HeadlessMain
+from ai_controller import get_valid_actions, pick_best_action
+from ai_planner import plan_action, weights_evaluator, dqn_evaluator
+from models.numpy_dqn import load_numpy_agent, pick_numpy_action
+from transposition import TranspositionTable
+from tests.test_features import random_boards, WEIGHTS
+
+def play_lines(pick, seed, moves=300):
+    # lines cleared in a seeded headless game, pick(piece_type, board, next_shapes) -> action
+    main = HeadlessMain()
+    main.reset_game(seed)
+    for _ in range(moves):
+        game = main.ai_game
+        piece_type = game.tetromino.shape
+        action = pick(piece_type, game.board, main.ai_next_shapes[:2])
+        if action is None:
+            break
+        game.apply_action(piece_type, *action)
+    return main.ai_score.lines
+
+def test_no_preview_matches_pick_best_action():
+    evaluate = weights_evaluator(WEIGHTS)
+    for board in random_boards(12, 20):
+        for piece_type in TETROMINOS:
+            assert plan_action(piece_type, board, [], evaluate) == pick_best_action(piece_type, board, WEIGHTS)
+
+def test_out_of_time_falls_back_to_current_piece():
+    evaluate = weights_evaluator(WEIGHTS)
+    for board in random_boards(13, 10):
+        expected = pick_best_action('T', board, WEIGHTS)
+        assert plan_action('T', board, ['I', 'O'], evaluate, time_budget=0) == expected
+
+def test_lookahead_returns_valid_move():
+    evaluate = weights_evaluator(WEIGHTS)
+    for board in random_boards(14, 10):
+        action = plan_action('S', board, ['Z', 'I'], evaluate, beam_width=4, time_budget=10)
+        valid_actions = get_valid_actions('S', board)
+        assert action in valid_actions or (action is None and not valid_actions)
+
+def test_lookahead_clears_at_least_as_many_lines_as_greedy():
+    # clears on the way to a leaf count, so looking ahead never gives up lines for a flat board
+    table = TranspositionTable()
+    evaluate = weights_evaluator(WEIGHTS)
+    model = load_numpy_agent('models/hard/dqn_hard.npz')
+    dqn_evaluate = dqn_evaluator(model)
+    for seed in (0, 1):
+        greedy = play_lines(lambda piece, board, shapes: pick_best_action(piece, board, WEIGHTS, table), seed)
+        planned = play_lines(lambda piece, board, shapes: plan_action(piece, board, shapes, evaluate, time_budget=10, table=table), seed)
+        assert planned >= greedy
+
+        greedy = play_lines(lambda piece, board, shapes: pick_numpy_action(model, piece, board, table), seed)
+        planned = play_lines(lambda piece, board, shapes: plan_action(piece, board, shapes, dqn_evaluate, time_budget=10, table=table), seed)
+        assert planned >= greedy
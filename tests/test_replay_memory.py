@@ -0,0 +1,82 @@
+import torch
+import numpy as np
+from dqn.replay_memory import ReplayMemory, PrioritizedReplayMemory, SumTree
+from dqn.train_utils import train_step
+from models.dqn_model import DQN
+
+def test_ring_buffer_overwrites_oldest():
+    memory = ReplayMemory(4)
+    for i in range(6):
+        memory.push(torch.full((8,), float(i)), (0, 0), i, torch.full((8,), i + 0.5), i == 5)
+    assert len(memory) == 4
+    # transitions 4 and 5 replaced 0 and 1
+    assert sorted(memory.states[:, 0].tolist()) == [2, 3, 4, 5]
+    assert sorted(memory.rewards[:, 0].tolist()) == [2, 3, 4, 5]
+
+def test_sample_shapes_and_rows_match():
+    memory = ReplayMemory(100)
+    for i in range(50):
+        memory.push(torch.full((8,), float(i)), (0, 0), i, torch.full((8,), i + 0.5), i % 10 == 0)
+    states, rewards, next_states, dones = memory.sample(16)
+    assert states.shape == next_states.shape == (16, 8)
+    assert rewards.shape == dones.shape == (16, 1)
+    # every row comes from one transition, no index is drawn twice
+    assert torch.equal(states[:, 0], rewards[:, 0])
+    assert torch.equal(next_states[:, 0], rewards[:, 0] + 0.5)
+    assert torch.equal(dones[:, 0], (rewards[:, 0] % 10 == 0).float())
+    assert len(set(rewards[:, 0].tolist())) == 16
+
+def test_push_batch_wraps_like_push():
+    one, batch = ReplayMemory(5), ReplayMemory(5)
+    states = torch.arange(56, dtype=torch.float32).reshape(7, 8)
+    for i in range(7):
+        one.push(states[i], None, i, states[i] + 1, i % 2)
+    batch.push_batch(states[:3], torch.arange(3.0), states[:3] + 1, torch.arange(3) % 2)
+    batch.push_batch(states[3:], torch.arange(3.0, 7), states[3:] + 1, torch.arange(3, 7) % 2)
+    assert len(one) == len(batch) == 5 and one.position == batch.position
+    for name in ('states', 'rewards', 'next_states', 'dones'):
+        assert torch.equal(getattr(one, name), getattr(batch, name))
+
+def test_train_step_runs():
+    torch.manual_seed(0)
+    model, target_model = DQN(), DQN()
+    target_model.load_state_dict(model.state_dict())
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    memory = ReplayMemory(100)
+    for _ in range(40):
+        memory.push(torch.rand(8), (0, 0), 1.0, torch.rand(8), False)
+    loss = train_step(model, target_model, memory, optimizer, batch_size=16)
+    assert loss >= 0
+
+def test_sum_tree_sums_and_finds():
+    tree = SumTree(5)
+    tree.update([0, 1, 2, 3, 4], [1.0, 2.0, 3.0, 4.0, 0.0])
+    assert tree.total() == 10
+    assert tree.find([0.5, 1.5, 3.5, 9.9]).tolist() == [0, 1, 2, 3]
+    tree.update([1], [0.0])
+    assert tree.total() == 8
+    assert tree.find([1.5]).tolist() == [2]
+
+def test_prioritized_sampling_follows_priorities():
+    np.random.seed(0)
+    memory = PrioritizedReplayMemory(8, alpha=1.0)
+    for i in range(8):
+        memory.push(torch.full((8,), float(i)), (0, 0), i, torch.zeros(8), False)
+    # only transition 3 has a real error left
+    memory.update_priorities(np.arange(8), [0, 0, 0, 5, 0, 0, 0, 0])
+    states, rewards, next_states, dones, weights, indices = memory.sample(32)
+    assert (indices == 3).mean() > 0.99
+    assert torch.equal(rewards[:, 0], torch.tensor(indices, dtype=torch.float32))
+    assert weights.shape == (32, 1) and weights.max() == 1
+
+def test_prioritized_train_step_updates_priorities():
+    torch.manual_seed(0)
+    model, target_model = DQN(), DQN()
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+    memory = PrioritizedReplayMemory(100)
+    for i in range(40):
+        memory.push(torch.rand(8), (0, 0), float(i), torch.rand(8), False)
+    before = memory.tree.get(np.arange(40)).copy()
+    train_step(model, target_model, memory, optimizer, batch_size=16, prioritized=True)
+    assert not np.array_equal(memory.tree.get(np.arange(40)), before)
+    assert np.isclose(memory.tree.total(), memory.tree.get(np.arange(40)).sum())
@@ -0,0 +1,34 @@
+from game.rules import *
+from game.bitboard import Bitboard
+from ai_controller import pick_best_action
+from models.dqn_model import load_agent, pick_dqn_action
+from transposition import TranspositionTable, board_hash
+from tests.test_features import random_boards, WEIGHTS
+
+def test_lru_eviction_and_counters():
+    table = TranspositionTable(max_size=2)
+    table.put('a', 1)
+    table.put('b', 2)
+    assert table.get('a') == 1
+    table.put('c', 3)  # 'b' is the least recently used
+    assert table.get('b') is None
+    assert table.get('c') == 3
+    assert len(table) == 2
+    assert (table.hits, table.misses) == (2, 1)
+
+def test_board_hash():
+    boards = [Bitboard.from_field(board) for board in random_boards(15, 30)]
+    hashes = [board_hash(board) for board in boards]
+    assert len(set(hashes)) == len(set(tuple(board.rows) for board in boards))
+    assert board_hash(boards[0].copy()) == hashes[0]
+
+def test_cached_picks_match_uncached():
+    table = TranspositionTable()
+    model = load_agent('models/easy/dqn_easy.pt')
+    boards = random_boards(16, 10)
+    for _ in range(2):
+        for board in boards:
+            for piece_type in TETROMINOS:
+                assert pick_best_action(piece_type, board, WEIGHTS, table) == pick_best_action(piece_type, board, WEIGHTS)
+                assert pick_dqn_action(model, piece_type, board, table, table) == pick_dqn_action(model, piece_type, board)
+    assert table.hits > table.misses
@@ -0,0 +1,55 @@
+import torch
+import numpy as np
+from dqn.vector_env import VectorEnv, greedy_choices
+from ai_controller import extract_features, get_candidate_features
+from models.dqn_model import load_agent, pick_dqn_action
+
+def test_candidates_stack_every_game():
+    env = VectorEnv(3, seed=1)
+    features, offsets = env.candidates()
+    assert offsets.tolist()[0] == 0 and offsets[-1] == len(features) == sum(len(m) for m in env.moves)
+    for i, main in enumerate(env.games):
+        game = main.ai_game
+        moves, expected = get_candidate_features(game.tetromino.shape, game.board)
+        assert env.moves[i] == moves
+        assert np.array_equal(features[offsets[i]:offsets[i + 1]], np.array(expected, dtype=np.float32))
+
+def test_batched_choices_match_single_game_picks():
+    model = load_agent('models/easy/dqn_easy.pt')
+    env = VectorEnv(4, seed=2)
+    for _ in range(20):
+        features, offsets = env.candidates()
+        with torch.inference_mode():
+            values = model(torch.from_numpy(features)).squeeze(1).numpy()
+        choices = greedy_choices(values, offsets)
+        for i, main in enumerate(env.games):
+            game = main.ai_game
+            rot_idx, x_pos, y = env.moves[i][choices[i]]
+            assert pick_dqn_action(model, game.tetromino.shape, game.board) == (rot_idx, x_pos)
+        env.step(choices)
+
+def test_finished_games_reset():
+    env = VectorEnv(2, seed=3, max_steps=5)
+    for _ in range(4):
+        states, actions, rewards, next_states, dones = env.step([0, 0])
+        assert dones == [False, False]
+        assert torch.equal(next_states[0], extract_features(env.games[0].ai_game.board))
+
+    states, actions, rewards, next_states, dones = env.step([0, 0])
+    # cut off by max_steps, not a real game end
+    assert dones == [False, False]
+    assert [steps for steps, reward, lines in env.finished] == [5, 5]
+    # the last next state belongs to the old game, the env already holds a new one
+    assert next_states[0].sum() > 0
+    assert env.steps == [0, 0]
+    assert all(not any(main.ai_game.board.rows) for main in env.games)
+
+def test_topped_out_game_is_done():
+    # every piece in the first column tops out quickly
+    env = VectorEnv(1, seed=4)
+    for _ in range(200):
+        states, actions, rewards, next_states, dones = env.step([0])
+        if env.finished:
+            break
+    assert dones == [True]
+    assert env.finished[0][0] < 200
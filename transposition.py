@@ -0,0 +1,56 @@
+import random
+from collections import OrderedDict
+from game.rules import COLUMNS, ROWS
+
+# cache for work that only depends on the board, shared by every path that
+# reaches the same board (different move orders, rotations, seeds, lookahead levels)
+
+TABLE_SIZE = 4096  # entries, one entry is every candidate of one (board, piece)
+
+# zobrist keys: one random 64-bit number per (row, row mask), xor-ed over the rows.
+# fixed seed so hashes are the same in every process
+_rng = random.Random(20240518)
+ZOBRIST = [[_rng.getrandbits(64) for _ in range(1 << COLUMNS)] for _ in range(ROWS)]
+
+def board_hash(board):
+    # board is a Bitboard. 64-bit keys are not verified, a collision is too unlikely to matter
+    key = 0
+    for y, mask in enumerate(board.rows):
+        key ^= ZOBRIST[y][mask]
+    return key
+
+class TranspositionTable:
+    # bounded LRU, the least recently used entry goes first
+    def __init__(self, max_size=TABLE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        # cached value or None; values are shared, never change them
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0